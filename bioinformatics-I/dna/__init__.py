@@ -0,0 +1,91 @@
+# Functions of the Bioinformatics I course (Where in the Genome Does DNA
+# Replication Begin?), with faster engines for the same problems.
+#
+# Importing the package has no side effects and loads nothing else: every
+# name below is imported from its module on first use (PEP 562), and NumPy
+# only when a function needs it (see lazy.py). So 'import dna' is cheap, and
+# worker processes which import it once can keep reusing it.
+#
+#   import dna
+#   dna.FrequentWords('ACGTTGCATGTCGCATGATGCATGAGAGCT', 4)
+
+import importlib
+
+# Module of every public name
+MODULES = {
+    'week1' : [
+        'PatternCount', 'CountDict', 'RemoveDuplicates', 'PatternToNumber',
+        'NumberToPattern', 'BASE4_DIGITS', 'HEX_NUCLEOTIDES', 'NUCLEOTIDE_TABLE',
+        'PatternsToNumbers', 'NumbersToPatterns', 'ComputingFrequencies', 'NUCLEOTIDE_CODES',
+        'CanonicalNumbers', 'EncodeGenome', 'KmerCodes', 'FastComputingFrequencies',
+        'FasterFrequentWords', 'FrequencyTable', 'BetterFrequentWords',
+        'SortedFrequentWords', 'SortedKmerCounts', 'RunLengths', 'FREQUENCY_ARRAY_MAX_K',
+        'FindFrequentWords', 'FrequentWords', 'FrequentWordsWithDuplicates',
+        'ReverseStrand', 'COMPLEMENT', 'BYTES_COMPLEMENT', 'ReverseComplement',
+        'PatternMatching', 'Clump', 'BetterClumpFinding',
+    ],
+    'week2' : [
+        'NEIGHBORHOOD_CACHE_SIZE', 'SKEW_STEP', 'Skew', 'SkewStream', 'SkewArray',
+        'MinSkew', 'HammingDistance', 'ApproximatePatternMatching',
+        'CountWithMismatches', 'ShiftAddMatches', 'ShiftAddPatternMatching',
+        'ShiftAddCountWithMismatches', 'ComputingFrequenciesWithMismatches',
+        'MismatchMasks', 'SuffixNeighborhood', 'NeighborNumbers', 'FastNeighbors',
+        'ReverseComplementNumber', 'FastComputingFrequenciesWithMismatches',
+        'FasterFrequentWordsWithMismatches', 'ImmediateNeighbors',
+        'IterativeNeighbors', 'Neighbors', 'FirstSymbol', 'Suffix',
+    ],
+    'packed' : [
+        'PACKING_TABLE', 'PackedGenome', 'PackedHammingDistance', 'PackedPatternMatching',
+    ],
+    'hamming' : [
+        'HAMMING_CHUNK_SIZE', 'WindowDistances', 'HammingPatternMatching',
+        'HammingCountWithMismatches', 'PopCount', 'PackKmers', 'DistanceMatrix',
+    ],
+    'automaton' : ['PatternAutomaton', 'MultiplePatternMatching'],
+    'index' : ['GenomeIndex', 'SuffixArray'],
+    'files' : ['GenomeFile', 'DecodeLine'],
+    'parallel' : [
+        'PARALLEL_MIN_SHARD_SIZE', 'GenomeShards', 'ParallelMap', 'ParallelComputingFrequencies',
+        'ParallelFrequentWords', 'ParallelClumpFinding',
+    ],
+    'cache' : ['COUNT_CACHE_DIRECTORY', 'COUNT_CACHE_SIZE', 'CountCache', 'MostFrequent'],
+    'external' : ['EXTERNAL_SORT_CHUNK_SIZE', 'ExternalFrequentWords'],
+    'query' : ['QUERY_CHUNK_SIZE', 'KmerCounts', 'CountKmers'],
+    'sketch' : [
+        'SKETCH_WIDTH', 'SKETCH_DEPTH', 'BLOOM_HASHES', 'SKETCH_CHUNK_SIZE', 'HashFunctions',
+        'HashNumbers', 'KmerChunks', 'BloomFilter', 'CountMinSketch', 'SketchGenomes',
+        'SketchFrequentWords', 'SketchClumpFinding',
+    ],
+    'incremental' : [
+        'CHECKPOINT_INTERVAL', 'SkewAccumulator', 'KmerAccumulator', 'ClumpAccumulator',
+        'SaveCheckpoint', 'LoadCheckpoint', 'FeedChunks',
+    ],
+    'batch' : [
+        'DatasetLines', 'Integers', 'Numbers', 'SolvePatternCount',
+        'SolveFrequentWords', 'SolveComputingFrequencies', 'SolveReverseComplement',
+        'SolvePatternMatching', 'SolveClumpFinding', 'SolveSkew', 'SolveMinSkew',
+        'SolveHammingDistance', 'SolveApproximatePatternMatching',
+        'SolveCountWithMismatches', 'SolveImmediateNeighbors', 'SolveNeighbors',
+        'SolveComputingFrequenciesWithMismatches', 'SolveFrequentWordsWithMismatches',
+        'PROBLEMS', 'ReadManifest', 'RunDatasetJobs', 'RunManifest',
+    ],
+    'instrument' : [
+        'Instrumentation', 'ProfileStats', 'SEQUENCE_TYPES', 'BASES_SAMPLE', 'Bases',
+        'PackageModules', 'Instrument',
+    ],
+    'lazy' : ['LazyModule', 'Optional', 'np'],
+}
+
+EXPORTS = dict((name, module) for module, names in MODULES.items() for name in names)
+
+__all__ = sorted(EXPORTS)
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    # not cached here, so the module stays the one place to look the name up
+    # (e.g. for Instrument)
+    return getattr(importlib.import_module('.' + EXPORTS[name], __name__), name)
+
+def __dir__():
+    return sorted(set(globals()) | set(EXPORTS))
@@ -0,0 +1,79 @@
+# Matching many patterns at once with an Aho-Corasick automaton.
+
+from collections import OrderedDict, deque
+
+from .week1 import RemoveDuplicates, ReverseComplement
+
+class PatternAutomaton(object):
+    """
+    Aho-Corasick automaton over a set of Patterns. It is a trie of all
+    Patterns where every node also has a failure link to the longest proper
+    suffix of its string which is a node too, so a Genome is scanned once no
+    matter how many Patterns are searched. Build it once and search() as many
+    Genomes as needed.
+    """
+    __slots__ = ('patterns', 'goto', 'fail', 'output')
+
+    def __init__(self, Patterns, reverse_complements=False):
+        patterns = []
+        for Pattern in Patterns:
+            patterns.append(Pattern)
+            if reverse_complements:
+                patterns.append(ReverseComplement(Pattern))
+        self.patterns = RemoveDuplicates(patterns)
+        self.goto = [{}]
+        self.output = [[]]
+        for index, Pattern in enumerate(self.patterns):
+            node = 0
+            for symbol in Pattern.encode('ascii'):
+                if symbol not in self.goto[node]:
+                    self.goto.append({})
+                    self.output.append([])
+                    self.goto[node][symbol] = len(self.goto) - 1
+                node = self.goto[node][symbol]
+            self.output[node].append(index)
+        # Failure links, breadth first so that shorter strings are done first
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for symbol, child in self.goto[node].items():
+                state = self.fail[node]
+                while state and symbol not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(symbol, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+                queue.append(child)
+
+    def matches(self, Genome):
+        """
+        Generate (position, Pattern) for every occurrence of every Pattern in
+        the Genome, overlapping ones included, in the order they end.
+        """
+        if isinstance(Genome, str):
+            Genome = Genome.encode('ascii')
+        goto, fail, output, patterns = self.goto, self.fail, self.output, self.patterns
+        state = 0
+        for j, symbol in enumerate(Genome):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            for index in output[state]:
+                yield j - len(patterns[index]) + 1, patterns[index]
+
+    def search(self, Genome):
+        """
+        Map every Pattern to the list of its starting positions in the Genome,
+        as PatternMatching would return them.
+        """
+        positions = OrderedDict((Pattern, []) for Pattern in self.patterns)
+        for position, Pattern in self.matches(Genome):
+            positions[Pattern].append(position)
+        return positions
+
+# Problem: Find all occurences of a collection of patterns in a string
+# Input: A collection of strings Patterns and a string Genome
+# Output: All starting positions in Genome where each pattern appears as a
+#         substring, optionally together with its reverse complement
+def MultiplePatternMatching(Patterns, Genome, reverse_complements=False):
+    return PatternAutomaton(Patterns, reverse_complements).search(Genome)
@@ -0,0 +1,170 @@
+# Solvers of the course problems on dataset files, and the manifest runner.
+
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from .lazy import np
+from .week1 import (
+    BetterClumpFinding, FastComputingFrequencies, FindFrequentWords,
+    PatternCount, PatternMatching, ReverseComplement
+)
+from .week2 import (
+    FastComputingFrequenciesWithMismatches, FastNeighbors,
+    FasterFrequentWordsWithMismatches, HammingDistance, ImmediateNeighbors,
+    MinSkew, ShiftAddCountWithMismatches, ShiftAddPatternMatching, SkewArray
+)
+from .hamming import HammingCountWithMismatches, HammingPatternMatching
+from .files import GenomeFile
+
+def DatasetLines(path):
+    """
+    Lines of a dataset file as strings. Course datasets sometimes start with
+    an 'Input' line and end with the expected 'Output', both are dropped.
+    """
+    lines = []
+    with GenomeFile(path) as genome_file:
+        views = genome_file.lines()
+        view = None
+        for view in views:
+            # Expected outputs copied from the course may hold non-ASCII symbols
+            line = bytes(view).decode('ascii', 'replace').strip()
+            if line.startswith('Output'):
+                break
+            if line and not (not lines and line.startswith('Input')):
+                lines.append(line)
+        # the mapping can only be closed once no view of it is left
+        del views, view
+    return lines
+
+def Integers(lines):
+    """
+    All integers written on the given lines, e.g. k, L and t of Clump.
+    """
+    return [int(num) for line in lines for num in line.split()]
+
+def Numbers(values):
+    return ' '.join([str(num) for num in values])
+
+def SolvePatternCount(lines):
+    return str(PatternCount(lines[0], lines[1]))
+
+def SolveFrequentWords(lines):
+    return ' '.join(FindFrequentWords(lines[0], *Integers(lines[1:])))
+
+def SolveComputingFrequencies(lines):
+    return Numbers(FastComputingFrequencies(lines[0], *Integers(lines[1:])))
+
+def SolveReverseComplement(lines):
+    return ReverseComplement(lines[0])
+
+def SolvePatternMatching(lines):
+    return Numbers(PatternMatching(lines[0], lines[1]))
+
+def SolveClumpFinding(lines):
+    return ' '.join(BetterClumpFinding(lines[0], *Integers(lines[1:])))
+
+def SolveSkew(lines):
+    return Numbers(SkewArray(lines[0]))
+
+def SolveMinSkew(lines):
+    return Numbers(MinSkew(lines[0]))
+
+def SolveHammingDistance(lines):
+    return str(HammingDistance(lines[0], lines[1]))
+
+def SolveApproximatePatternMatching(lines):
+    Matching = HammingPatternMatching if np is not None else ShiftAddPatternMatching
+    return Numbers(Matching(lines[0], lines[1], *Integers(lines[2:])))
+
+def SolveCountWithMismatches(lines):
+    Count = HammingCountWithMismatches if np is not None else ShiftAddCountWithMismatches
+    return str(Count(lines[0], lines[1], *Integers(lines[2:])))
+
+def SolveImmediateNeighbors(lines):
+    return '\n'.join(ImmediateNeighbors(lines[0]))
+
+def SolveNeighbors(lines):
+    return '\n'.join(FastNeighbors(lines[0], *Integers(lines[1:])))
+
+def SolveComputingFrequenciesWithMismatches(lines):
+    return Numbers(FastComputingFrequenciesWithMismatches(lines[0], *Integers(lines[1:])))
+
+def SolveFrequentWordsWithMismatches(lines):
+    return ' '.join(FasterFrequentWordsWithMismatches(lines[0], *Integers(lines[1:])))
+
+# Problems a manifest can name, each one takes the dataset lines and returns
+# the text of the output file
+PROBLEMS = {
+    'PatternCount' : SolvePatternCount,
+    'FrequentWords' : SolveFrequentWords,
+    'ComputingFrequencies' : SolveComputingFrequencies,
+    'ReverseComplement' : SolveReverseComplement,
+    'PatternMatching' : SolvePatternMatching,
+    'ClumpFinding' : SolveClumpFinding,
+    'Skew' : SolveSkew,
+    'MinSkew' : SolveMinSkew,
+    'HammingDistance' : SolveHammingDistance,
+    'ApproximatePatternMatching' : SolveApproximatePatternMatching,
+    'CountWithMismatches' : SolveCountWithMismatches,
+    'ImmediateNeighbors' : SolveImmediateNeighbors,
+    'Neighbors' : SolveNeighbors,
+    'ComputingFrequenciesWithMismatches' : SolveComputingFrequenciesWithMismatches,
+    'FrequentWordsWithMismatches' : SolveFrequentWordsWithMismatches,
+}
+
+def ReadManifest(path):
+    """
+    Read the jobs of a manifest file. Every line holds a problem name (a key
+    of PROBLEMS), a dataset and an output file, optionally followed by a file
+    with the known correct output, separated by whitespace. Empty lines and
+    lines starting with '#' are skipped. Paths are relative to the manifest.
+    Returns (problem, dataset, output, expected), expected may be None.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    with open(path) as manifest:
+        for number, line in enumerate(manifest, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            if len(fields) not in (3, 4) or fields[0] not in PROBLEMS:
+                raise ValueError('%s:%d: expected "problem dataset output [expected]", got %r'
+                                 % (path, number, line.strip()))
+            problem, dataset, output = fields[:3]
+            expected = os.path.join(base, fields[3]) if len(fields) == 4 else None
+            jobs.append((problem, os.path.join(base, dataset), os.path.join(base, output), expected))
+    return jobs
+
+def RunDatasetJobs(dataset, jobs):
+    """
+    Parse a dataset once and run all jobs (problem, output) which use it.
+    Returns (problem, output, seconds) for every job.
+    """
+    lines = DatasetLines(dataset)
+    results = []
+    for problem, output in jobs:
+        start = time.time()
+        answer = PROBLEMS[problem](lines)
+        if os.path.dirname(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, 'w') as f:
+            f.write(answer + '\n')
+        results.append((problem, output, time.time() - start))
+    return results
+
+def RunManifest(path, workers=None):
+    """
+    Run every job of a manifest. Jobs are grouped by dataset, so every dataset
+    is read once, and the groups run concurrently in a pool of 'workers'
+    processes which import the package only once.
+    """
+    groups = OrderedDict()
+    for problem, dataset, output, expected in ReadManifest(path):
+        groups.setdefault(dataset, []).append((problem, output))
+    workers = min(workers or os.cpu_count() or 1, max(len(groups), 1))
+    if workers == 1:
+        return [RunDatasetJobs(dataset, jobs) for dataset, jobs in groups.items()]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(RunDatasetJobs, list(groups), list(groups.values())))
@@ -0,0 +1,107 @@
+# Frequency arrays cached on disk.
+
+import hashlib
+import os
+
+from .lazy import np
+from .week1 import FastComputingFrequencies, NumbersToPatterns
+from .week2 import FastComputingFrequenciesWithMismatches
+
+# Default location and size bound of the count cache
+COUNT_CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'replication')
+COUNT_CACHE_SIZE = 2**30
+
+class CountCache(object):
+    """
+    Frequency arrays saved on disk as .npy files, so the counts of a genome
+    which is analysed again and again are computed only once. A file is
+    named after the SHA-1 of the genome together with k (and d, and whether
+    reverse complements were counted), and is read back as a memory map,
+    e.g. a repeated FrequentWords(Vibrio, 9) is a memory map plus a max.
+
+    When the files take more than 'max_bytes' the least recently used ones
+    are removed. Needs NumPy.
+    """
+    __slots__ = ('directory', 'max_bytes')
+
+    def __init__(self, directory=COUNT_CACHE_DIRECTORY, max_bytes=COUNT_CACHE_SIZE):
+        if np is None:
+            raise ImportError('CountCache needs NumPy')
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, Text, k, d=None, reverse_complements=False):
+        digest = hashlib.sha1(Text.encode('ascii') if isinstance(Text, str) else Text)
+        name = '%s-k%d' % (digest.hexdigest(), k)
+        if d is not None:
+            name += '-d%d' % d
+        if reverse_complements:
+            name += '-rc'
+        return os.path.join(self.directory, name + '.npy')
+
+    def array(self, path, compute):
+        """
+        Memory map of the array saved in 'path', computed and saved first if
+        it is not in the cache yet.
+        """
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            # write to a temporary file first, so other processes never map
+            # a half written array
+            temporary = '%s.%d.tmp' % (path, os.getpid())
+            with open(temporary, 'wb') as f:
+                np.save(f, np.asarray(compute()))
+            os.replace(temporary, path)
+            self.evict()
+        return np.load(path, mmap_mode='r')
+
+    def evict(self):
+        """
+        Remove the least recently used arrays until the cache fits into
+        'max_bytes'. The most recent array is always kept.
+        """
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npy'):
+                stat = os.stat(os.path.join(self.directory, name))
+                files.append((stat.st_mtime, stat.st_size, name))
+        files.sort()
+        size = sum(file_size for mtime, file_size, name in files)
+        for mtime, file_size, name in files[:-1]:
+            if size <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            size -= file_size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.npy'):
+                os.remove(os.path.join(self.directory, name))
+
+    def frequencies(self, Text, k):
+        """
+        FastComputingFrequencies of Text, from the cache.
+        """
+        return self.array(self.path(Text, k), lambda: FastComputingFrequencies(Text, k))
+
+    def frequencies_with_mismatches(self, Text, k, d, reverse_complements=False):
+        """
+        FastComputingFrequenciesWithMismatches of Text, from the cache.
+        """
+        return self.array(self.path(Text, k, d, reverse_complements),
+            lambda: FastComputingFrequenciesWithMismatches(Text, k, d, reverse_complements))
+
+    def frequent_words(self, Text, k):
+        return MostFrequent(self.frequencies(Text, k), k)
+
+    def frequent_words_with_mismatches(self, Text, k, d, reverse_complements=False):
+        return MostFrequent(self.frequencies_with_mismatches(Text, k, d, reverse_complements), k)
+
+def MostFrequent(FrequencyArray, k):
+    """
+    The k-mers with the largest count in a frequency array (NumPy array).
+    """
+    indices = np.flatnonzero(FrequencyArray == FrequencyArray.max())
+    return NumbersToPatterns(indices, k)
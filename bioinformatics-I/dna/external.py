@@ -0,0 +1,61 @@
+# Frequent words by sorting, for genomes whose k-mers do not fit in memory.
+
+import os
+import tempfile
+
+from .lazy import np
+from .week1 import EncodeGenome, KmerCodes, NumbersToPatterns, RunLengths
+
+# Number of k-mers sorted in memory at once by ExternalFrequentWords
+EXTERNAL_SORT_CHUNK_SIZE = 2**24
+
+def ExternalFrequentWords(Genome, k, chunk_size=EXTERNAL_SORT_CHUNK_SIZE, directory=None):
+    """
+    SortedFrequentWords for genomes whose k-mer numbers do not fit in memory
+    (e.g. a GenomeFile view). The Genome is cut into chunks of 'chunk_size'
+    k-mers (overlapping by k-1 nucleotides), every chunk is sorted and saved
+    as a run of distinct numbers and their counts in a temporary 'directory'.
+    The runs are then merged one range of numbers at a time: the ranges are
+    cut at evenly spaced samples of the runs, every (memory-mapped) run
+    contributes the slice found by binary search, and the slices are sorted
+    and counted together. Needs NumPy.
+    """
+    if k > 32:
+        raise ValueError('ExternalFrequentWords works for k up to 32')
+    with tempfile.TemporaryDirectory(dir=directory) as temporary:
+        runs = []
+        for start in range(0, max(len(Genome) - k + 1, 0), chunk_size):
+            numbers = KmerCodes(EncodeGenome(Genome[start:start+chunk_size+k-1]), k)
+            numbers, counts = RunLengths(np.sort(numbers.view(np.uint64)))
+            path = os.path.join(temporary, 'run%d' % len(runs))
+            np.save(path + '-numbers.npy', numbers)
+            np.save(path + '-counts.npy', counts)
+            runs.append((np.load(path + '-numbers.npy', mmap_mode='r'),
+                         np.load(path + '-counts.npy', mmap_mode='r')))
+        if not runs:
+            return []
+        ranges = -(-sum(len(numbers) for numbers, counts in runs) // chunk_size)
+        samples = np.sort(np.concatenate([numbers[::max(len(numbers) // (16 * ranges), 1)]
+                                          for numbers, counts in runs]))
+        bounds = samples[np.linspace(0, len(samples), ranges + 1)[1:-1].astype(np.int64)]
+        FrequentNumbers = []
+        maxCount = 0
+        low = [0] * len(runs)
+        for bound in list(bounds) + [None]:
+            slices = []
+            for run, (numbers, counts) in enumerate(runs):
+                high = len(numbers) if bound is None else int(np.searchsorted(numbers, bound))
+                slices.append((numbers[low[run]:high], counts[low[run]:high]))
+                low[run] = high
+            numbers = np.concatenate([numbers for numbers, counts in slices])
+            if len(numbers) == 0:
+                continue
+            order = np.argsort(numbers, kind='stable')
+            counts = np.concatenate([counts for numbers, counts in slices])[order]
+            numbers, counts = RunLengths(numbers[order], counts)
+            if counts.max() > maxCount:
+                maxCount = counts.max()
+                FrequentNumbers = []
+            if counts.max() == maxCount:
+                FrequentNumbers.extend(numbers[counts == maxCount])
+        return NumbersToPatterns(np.array(FrequentNumbers, dtype=np.uint64), k)
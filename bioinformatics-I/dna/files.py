@@ -0,0 +1,136 @@
+# Memory-mapped dataset and FASTA files.
+
+import io
+import mmap
+
+class GenomeFile(object):
+    """
+    A dataset or FASTA file mapped into memory. Nothing is read up front, the
+    operating system pages the file in as it is used, so the genome may be
+    larger than RAM. Lines and single-line sequences are handed out as
+    memoryviews of the mapping, i.e. without copying them (wrapped FASTA
+    sequences are streamed line by line, see sequence_lines()). Every record
+    of a FASTA file is a separate sequence. Skew, PatternCount,
+    PatternMatching, EncodeGenome, FastComputingFrequencies, FrequencyTable,
+    BetterFrequentWords and BetterClumpFinding accept such views in place of
+    a string.
+
+    Source is either a path or an open file (e.g. sys.stdin redirected from a
+    dataset). Pipes cannot be mapped, in that case the input is read once.
+    Use it in a with statement to close it, see close().
+    """
+    __slots__ = ('file', 'data', 'owns_file')
+
+    def __init__(self, source):
+        self.owns_file = not hasattr(source, 'fileno')
+        self.file = open(source, 'rb') if self.owns_file else source
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError, io.UnsupportedOperation):
+            # Empty file, pipe or terminal
+            self.data = getattr(self.file, 'buffer', self.file).read()
+
+    def close(self):
+        """
+        Close the mapping. All views handed out before (lines, sequences and
+        slices of them, also the one held by an unfinished lines() generator)
+        have to be dropped first, otherwise the mapping cannot be closed and
+        BufferError is raised. Copy what is needed (e.g. with bytes() or
+        DecodeLine) before closing.
+        """
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        if self.owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def lines(self):
+        """
+        Generate a memoryview of every line, without the line break.
+        """
+        data = self.data
+        view = memoryview(data)
+        start = 0
+        while start < len(data):
+            end = data.find(b'\n', start)
+            if end == -1:
+                end = len(data)
+            stop = end
+            if stop > start and data[stop-1:stop] == b'\r':
+                stop -= 1
+            yield view[start:stop]
+            start = end + 1
+
+    def sequence_lines(self, record=0):
+        """
+        Generate the lines which hold the sequence of one FASTA record (the
+        first by default, None for all of them), i.e. skip headers (lines
+        starting with '>') and empty lines. A file without headers is a
+        single record. This is how a wrapped FASTA genome is streamed, e.g.
+        into SkewStream or FeedChunks, without joining it.
+        """
+        current = None
+        for line in self.lines():
+            if not len(line):
+                continue
+            if line[:1] == b'>':
+                current = 0 if current is None else current + 1
+                continue
+            if current is None:
+                current = 0
+            if record is None or current == record:
+                yield line
+            elif current > record:
+                return
+
+    def sequence(self, record=0):
+        """
+        Return the sequence of one FASTA record (the first by default), so
+        k-mers never span two records. If it is written on a single line, as
+        in the course datasets, this is a view of the mapping. A sequence
+        wrapped over several lines has to be joined, i.e. copied into memory
+        once; stream sequence_lines() instead for genomes larger than RAM.
+        """
+        lines = self.sequence_lines(record)
+        first = next(lines, None)
+        if first is None:
+            return memoryview(b'')
+        second = next(lines, None)
+        if second is None:
+            return first
+        return b''.join([first, second] + list(lines))
+
+    def records(self):
+        """
+        Generate (header, sequence) for every FASTA record, the header
+        without the '>' (None for a file without headers) and the sequence
+        as in sequence().
+        """
+        header, lines = None, []
+        for line in self.lines():
+            if line[:1] == b'>':
+                if lines or header is not None:
+                    yield header, self.join(lines)
+                header, lines = line[1:], []
+            elif len(line):
+                lines.append(line)
+        if lines or header is not None:
+            yield header, self.join(lines)
+
+    @staticmethod
+    def join(lines):
+        if len(lines) == 1:
+            return lines[0]
+        return b''.join(lines) if lines else memoryview(b'')
+
+def DecodeLine(line):
+    """
+    Turn a (short) line from GenomeFile into a string, e.g. a Pattern or the
+    line holding k and d.
+    """
+    return bytes(line).decode('ascii')
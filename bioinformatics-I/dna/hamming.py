@@ -0,0 +1,79 @@
+# Hamming distances of whole batches of k-mers, with NumPy.
+
+from .lazy import np
+from .week1 import EncodeGenome, PatternsToNumbers
+
+# Largest number of distances (or compared nucleotides) held in memory at once
+HAMMING_CHUNK_SIZE = 2**20
+
+def WindowDistances(Pattern, Text, chunk_size=HAMMING_CHUNK_SIZE):
+    """
+    Hamming distance from Pattern to every k-mer of Text, i.e. entry i is
+    HammingDistance(Pattern, Text[i:i+k]). The windows are not copied: for
+    every position j of the Pattern the shifted encoded Text is compared with
+    Pattern[j] and the mismatches are added up. The Text is processed
+    'chunk_size' windows at a time, so apart from the result the memory does
+    not grow with the Text. Needs NumPy.
+    """
+    k = len(Pattern)
+    Codes = EncodeGenome(Text)
+    n = len(Codes) - k + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    pattern = EncodeGenome(Pattern)
+    distances = np.zeros(n, dtype=np.min_scalar_type(k))
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        chunk = distances[start:end]
+        for j in range(k):
+            chunk += Codes[start+j:end+j] != pattern[j]
+    return distances
+
+def HammingPatternMatching(Pattern, Text, d):
+    """
+    ApproximatePatternMatching with all distances computed by WindowDistances.
+    """
+    return [int(i) for i in np.flatnonzero(WindowDistances(Pattern, Text) <= d)]
+
+def HammingCountWithMismatches(Pattern, Text, d):
+    return int(np.count_nonzero(WindowDistances(Pattern, Text) <= d))
+
+def PopCount(values):
+    """
+    Number of set bits in every element of an unsigned NumPy array.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    table = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+    counts = table[values.view(np.uint8)].reshape(values.shape + (values.itemsize,))
+    return counts.sum(axis=-1, dtype=np.uint8)
+
+def PackKmers(Patterns):
+    """
+    The PatternToNumber of every k-mer (k up to 32) as an array of uint64,
+    and k.
+    """
+    Patterns = list(Patterns)
+    return PatternsToNumbers(Patterns), len(Patterns[0]) if Patterns else 0
+
+def DistanceMatrix(Patterns, Others=None, chunk_size=HAMMING_CHUNK_SIZE):
+    """
+    Matrix of Hamming distances between every k-mer in Patterns and every
+    k-mer in Others (by default Patterns again, i.e. all against all). The
+    k-mers are packed into 2-bit numbers and compared as in
+    PackedHammingDistance: XOR, fold every 2-bit slot into its low bit and
+    count the set bits. Rows are computed in blocks of about 'chunk_size'
+    entries. Needs NumPy.
+    """
+    rows, k = PackKmers(Patterns)
+    columns, other_k = (rows, k) if Others is None else PackKmers(Others)
+    if len(rows) and len(columns) and other_k != k:
+        raise ValueError('Patterns and Others must have the same length k')
+    low_bits = np.uint64(int('01' * k, 2) if k else 0)
+    matrix = np.zeros((len(rows), len(columns)), dtype=np.uint8)
+    block = max(chunk_size // max(len(columns), 1), 1)
+    for start in range(0, len(rows), block):
+        diff = rows[start:start+block, None] ^ columns[None, :]
+        diff = (diff | (diff >> np.uint64(1))) & low_bits
+        matrix[start:start+block] = PopCount(diff)
+    return matrix
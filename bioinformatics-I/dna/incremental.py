@@ -0,0 +1,200 @@
+# Analysis of a genome which arrives in chunks, with checkpoints.
+
+import os
+import pickle
+
+from .lazy import np
+from .week1 import (
+    FREQUENCY_ARRAY_MAX_K, EncodeGenome, FastComputingFrequencies,
+    FrequencyTable, KmerCodes, PatternToNumber
+)
+from .week2 import SKEW_STEP
+from .cache import MostFrequent
+
+# Number of nucleotides fed to the accumulators between two checkpoints
+CHECKPOINT_INTERVAL = 2**24
+
+class SkewAccumulator(object):
+    """
+    Running skew of a genome which arrives in chunks. After every update()
+    'minimum_indices' are the positions MinSkew would return for everything
+    seen so far, and 'skew' is the last skew value.
+    """
+    __slots__ = ('length', 'skew', 'minimum', 'minimum_indices')
+
+    def __init__(self):
+        self.length = 0
+        self.skew = 0
+        self.minimum = 0
+        self.minimum_indices = [0]
+
+    def update(self, chunk):
+        skew, minimum = self.skew, self.minimum
+        for position, nucleotide in enumerate(chunk, self.length + 1):
+            skew += SKEW_STEP.get(nucleotide, 0)
+            if skew < minimum:
+                minimum = skew
+                self.minimum_indices = [position]
+            elif skew == minimum:
+                self.minimum_indices.append(position)
+        self.length += len(chunk)
+        self.skew, self.minimum = skew, minimum
+
+class KmerAccumulator(object):
+    """
+    Running k-mer counts of a genome which arrives in chunks. The last k-1
+    nucleotides of every chunk are kept in 'tail' and put in front of the next
+    one, so k-mers spanning two chunks are counted too. Counts are kept in a
+    frequency array (with NumPy, for k up to FREQUENCY_ARRAY_MAX_K) or in a
+    frequency table. A frequency array is pickled sparsely, only its nonzero
+    entries, so a checkpoint does not hold all 4**k counts.
+    """
+    __slots__ = ('k', 'length', 'tail', 'counts')
+
+    def __init__(self, k):
+        self.k = k
+        self.length = 0
+        self.tail = ''
+        if np is not None and k <= FREQUENCY_ARRAY_MAX_K:
+            self.counts = np.zeros(4**k, dtype=np.int64)
+        else:
+            self.counts = {}
+
+    def update(self, chunk):
+        if not isinstance(chunk, str):
+            chunk = bytes(chunk).decode('ascii')
+        Text = self.tail + chunk
+        if isinstance(self.counts, dict):
+            for Pattern, count in FrequencyTable(Text, self.k).items():
+                self.counts[Pattern] = self.counts.get(Pattern, 0) + count
+        elif 16 * (len(Text) - self.k + 1) < len(self.counts):
+            # a short chunk (e.g. a FASTA line) is added k-mer by k-mer
+            # instead of through a whole new 4**k array
+            np.add.at(self.counts, KmerCodes(EncodeGenome(Text), self.k), 1)
+        elif len(Text) >= self.k:
+            self.counts += FastComputingFrequencies(Text, self.k)
+        self.tail = Text[max(len(Text)-self.k+1, 0):] if self.k > 1 else ''
+        self.length += len(chunk)
+
+    def __getstate__(self):
+        counts = self.counts
+        if not isinstance(counts, dict):
+            numbers = np.flatnonzero(counts)
+            counts = (len(counts), numbers, counts[numbers])
+        return self.k, self.length, self.tail, counts
+
+    def __setstate__(self, state):
+        self.k, self.length, self.tail, counts = state
+        if isinstance(counts, tuple):
+            size, numbers, values = counts
+            counts = np.zeros(size, dtype=np.int64)
+            counts[numbers] = values
+        self.counts = counts
+
+    def frequency_array(self):
+        """
+        Counts so far as in FastComputingFrequencies.
+        """
+        if not isinstance(self.counts, dict):
+            return self.counts
+        FrequencyArray = [0] * (4**self.k)
+        for Pattern, count in self.counts.items():
+            FrequencyArray[PatternToNumber(Pattern)] = count
+        return FrequencyArray
+
+    def frequent_words(self):
+        if not isinstance(self.counts, dict):
+            return MostFrequent(self.counts, self.k) if self.counts.any() else []
+        if not self.counts:
+            return []
+        maxCount = max(self.counts.values())
+        return [Pattern for Pattern in self.counts if self.counts[Pattern] == maxCount]
+
+class ClumpAccumulator(object):
+    """
+    (L,t)-clumps of a genome which arrives in chunks, found as in
+    BetterClumpFinding. 'window' holds the last L nucleotides and 'Count'
+    the k-mers inside them, so the window keeps sliding across chunk
+    boundaries. 'clump' lists the clumps found so far, in the same order as
+    BetterClumpFinding over the whole genome.
+    """
+    __slots__ = ('k', 'L', 't', 'length', 'window', 'Count', 'found', 'clump')
+
+    def __init__(self, k, L, t):
+        self.k, self.L, self.t = k, L, t
+        self.length = 0
+        self.window = ''
+        self.Count = None
+        self.found = set()
+        self.clump = []
+
+    def add(self, Pattern):
+        self.Count[Pattern] = self.Count.get(Pattern, 0) + 1
+        if self.Count[Pattern] >= self.t and Pattern not in self.found:
+            self.found.add(Pattern)
+            self.clump.append(Pattern)
+
+    def update(self, chunk):
+        if not isinstance(chunk, str):
+            chunk = bytes(chunk).decode('ascii')
+        k, L = self.k, self.L
+        Text = self.window + chunk
+        self.length += len(chunk)
+        if self.Count is None:
+            # the first window is counted once it is complete
+            if len(Text) < L:
+                self.window = Text
+                return
+            self.Count = {}
+            for i in range(L - k + 1):
+                self.add(Text[i:i+k])
+        Count = self.Count
+        for i in range(1, len(Text) - L + 1):
+            FirstPattern = Text[i-1:i-1+k]
+            Count[FirstPattern] -= 1
+            if Count[FirstPattern] == 0:
+                del Count[FirstPattern]
+            self.add(Text[i+L-k:i+L])
+        self.window = Text[len(Text)-L:]
+
+def SaveCheckpoint(path, accumulators):
+    """
+    Save a list of accumulators (pickled), replacing the previous checkpoint
+    only once the new one is written whole.
+    """
+    temporary = '%s.%d.tmp' % (path, os.getpid())
+    with open(temporary, 'wb') as f:
+        pickle.dump(accumulators, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+
+def LoadCheckpoint(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def FeedChunks(chunks, accumulators, checkpoint=None, interval=CHECKPOINT_INTERVAL):
+    """
+    Feed every chunk of a genome to all accumulators, saving them to the
+    'checkpoint' file whenever another 'interval' nucleotides have been fed,
+    and once more at the end. If the checkpoint already exists the
+    accumulators are resumed from it instead, and the nucleotides they have
+    seen are skipped. Returns the accumulators.
+    """
+    skip = 0
+    unsaved = 0
+    if checkpoint is not None and os.path.exists(checkpoint):
+        accumulators = LoadCheckpoint(checkpoint)
+        skip = accumulators[0].length
+    for chunk in chunks:
+        if skip >= len(chunk):
+            skip -= len(chunk)
+            continue
+        chunk, skip = chunk[skip:], 0
+        for accumulator in accumulators:
+            accumulator.update(chunk)
+        unsaved += len(chunk)
+        if checkpoint is not None and unsaved >= interval:
+            SaveCheckpoint(checkpoint, accumulators)
+            unsaved = 0
+    if checkpoint is not None and unsaved:
+        SaveCheckpoint(checkpoint, accumulators)
+    return accumulators
@@ -0,0 +1,128 @@
+# Suffix array and FM-index of a genome.
+
+from .lazy import np
+from .week1 import EncodeGenome
+
+class GenomeIndex(object):
+    """
+    Suffix array and FM-index (Burrows-Wheeler transform) of a genome, for
+    answering many queries against the same reference. The genome is kept as
+    codes 1-4 for A, C, G, T, followed by the end marker '$' coded as 0.
+
+    'first[c]' is the number of symbols smaller than c, i.e. where the rows
+    starting with c begin in the sorted suffixes, and 'occurrences[c][i]'
+    is the number of c's among the first i symbols of the BWT. With these a
+    Pattern is matched backwards one symbol at a time, so PatternCount takes
+    O(|Pattern|) steps and PatternMatching just reads the suffix array.
+    PatternCount, PatternMatching, ApproximatePatternMatching and
+    CountWithMismatches accept a GenomeIndex in place of the Text.
+
+    Needs NumPy. The index is saved with save() and read back with
+    GenomeIndex.load(), which only stores the genome and the suffix array and
+    recomputes the rest.
+    """
+    __slots__ = ('text', 'suffix_array', 'first', 'occurrences')
+
+    def __init__(self, Text=None):
+        if np is None:
+            raise ImportError('GenomeIndex needs NumPy')
+        if Text is not None:
+            text = np.zeros(len(Text) + 1, dtype=np.uint8)
+            text[:-1] = EncodeGenome(Text) + 1
+            self.build(text, SuffixArray(text))
+
+    def build(self, text, suffix_array):
+        self.text = text
+        self.suffix_array = suffix_array
+        bwt = text[suffix_array - 1]
+        self.first = np.concatenate(([0], np.cumsum(np.bincount(text, minlength=5))))[:5]
+        self.occurrences = np.zeros((5, len(text) + 1), dtype=suffix_array.dtype)
+        for code in range(1, 5):
+            np.cumsum(bwt == code, out=self.occurrences[code, 1:])
+
+    def save(self, path):
+        # through a file object, so np.savez does not append '.npz' to the
+        # path and load(path) finds the file
+        with open(path, 'wb') as f:
+            np.savez(f, text=self.text, suffix_array=self.suffix_array)
+
+    @staticmethod
+    def load(path):
+        index = GenomeIndex()
+        with np.load(path) as arrays:
+            index.build(arrays['text'], arrays['suffix_array'])
+        return index
+
+    def __len__(self):
+        return len(self.text) - 1
+
+    def interval(self, Pattern):
+        """
+        Return (top, bottom) such that suffix_array[top:bottom] are the
+        positions where Pattern starts, found by backward search.
+        """
+        top, bottom = 0, len(self.text)
+        for nucleotide in reversed(Pattern):
+            code = 'ACGT'.find(nucleotide) + 1
+            if code == 0:
+                return 0, 0
+            top = int(self.first[code] + self.occurrences[code, top])
+            bottom = int(self.first[code] + self.occurrences[code, bottom])
+            if top >= bottom:
+                return 0, 0
+        return top, bottom
+
+    def pattern_count(self, Pattern):
+        top, bottom = self.interval(Pattern)
+        return bottom - top
+
+    def pattern_matching(self, Pattern):
+        top, bottom = self.interval(Pattern)
+        return sorted(int(position) for position in self.suffix_array[top:bottom])
+
+    def approximate_pattern_matching(self, Pattern, d):
+        """
+        Seed and extend: if Pattern is cut into d+1 pieces, at least one of
+        them appears without a mismatch. Every exact occurrence of a piece
+        is a candidate, which is then checked against the whole Pattern.
+        """
+        k = len(Pattern)
+        n = len(self)
+        if d >= k:
+            return list(range(n - k + 1))
+        codes = EncodeGenome(Pattern) + 1
+        candidates = set()
+        for piece in range(d + 1):
+            start = piece * k // (d + 1)
+            end = (piece + 1) * k // (d + 1)
+            for position in self.pattern_matching(Pattern[start:end]):
+                if start <= position <= n - k + start:
+                    candidates.add(position - start)
+        positions = []
+        for position in sorted(candidates):
+            if np.count_nonzero(self.text[position:position+k] != codes) <= d:
+                positions.append(position)
+        return positions
+
+def SuffixArray(text):
+    """
+    Sort all suffixes of an encoded text which ends with a unique smallest
+    symbol, by prefix doubling: once suffixes are ranked by their first h
+    symbols, ranking pairs (rank of i, rank of i+h) sorts them by their first
+    2*h symbols. Stops as soon as all ranks are different.
+    """
+    n = len(text)
+    dtype = np.int32 if n < 2**31 else np.int64
+    rank = text.astype(np.int64)
+    h = 1
+    while True:
+        second = np.zeros(n, dtype=np.int64)
+        second[:n-h] = rank[h:] + 1
+        key = rank * (n + 1) + second
+        suffix_array = np.argsort(key, kind='stable')
+        sorted_key = key[suffix_array]
+        rank = np.empty(n, dtype=np.int64)
+        rank[suffix_array] = np.concatenate(([0], np.cumsum(sorted_key[1:] != sorted_key[:-1])))
+        if rank[suffix_array[-1]] == n - 1 or h >= n:
+            return suffix_array.astype(dtype)
+        h *= 2
@@ -0,0 +1,168 @@
+# Call counts and timing of the functions of the package.
+
+import importlib
+import inspect
+import pstats
+import sys
+import time
+from functools import wraps
+
+from .packed import PackedGenome
+
+class Instrumentation(object):
+    """
+    Call counts, wall time and bases processed of the functions in the
+    package. Instrument() replaces every function with a timing wrapper in
+    all modules which refer to it, so calls between them (e.g. FrequentWords
+    -> CountDict -> PatternCount) are recorded too. Until then nothing is
+    wrapped, so there is no overhead at all. Only calls in this process are
+    seen, not the ones in worker processes.
+
+    For every function 'stats' holds [calls, outermost calls, own seconds,
+    cumulative seconds, bases, {caller : calls}]. Bases are the length of
+    the longest DNA argument of every call (see Bases).
+    """
+    __slots__ = ('stats', 'stack', 'depth', 'functions', 'originals')
+
+    def __init__(self):
+        self.stats = {}
+        self.stack = []
+        self.depth = {}
+        self.functions = {}
+        self.originals = []
+
+    def wrap(self, name, function):
+        stats = self.stats.setdefault(name, [0, 0, 0.0, 0.0, 0, {}])
+        stack, depth = self.stack, self.depth
+        depth[name] = 0
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            caller = stack[-1][0] if stack else None
+            frame = [name, 0.0]
+            stack.append(frame)
+            depth[name] += 1
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                depth[name] -= 1
+                stats[0] += 1
+                stats[2] += elapsed - frame[1]
+                # time of recursive calls is already in the outermost call
+                if depth[name] == 0:
+                    stats[1] += 1
+                    stats[3] += elapsed
+                stats[4] += max([Bases(argument) for argument in args] or [0])
+                stats[5][caller] = stats[5].get(caller, 0) + 1
+                if stack:
+                    stack[-1][1] += elapsed
+        return wrapper
+
+    def start(self, names=None):
+        wrappers = {}
+        for module in PackageModules():
+            namespace = vars(module)
+            for name, function in list(namespace.items()):
+                if (inspect.isfunction(function)
+                        and function.__module__.startswith(__package__ + '.')
+                        and function.__module__ != __name__
+                        and not inspect.isgeneratorfunction(function)
+                        and (names is None or name in names)):
+                    if function not in wrappers:
+                        wrappers[function] = self.wrap(name, function)
+                        self.functions[name] = function
+                    self.originals.append((namespace, name, function))
+                    namespace[name] = wrappers[function]
+        return self
+
+    def stop(self):
+        for namespace, name, function in self.originals:
+            namespace[name] = function
+        self.originals = []
+
+    def report(self, file=None):
+        """
+        Print a flat report, the functions with the most own time first.
+        """
+        file = file or sys.stdout
+        print('%-42s %10s %12s %12s %14s' % ('function', 'calls', 'own s', 'cumulative s', 'bases'),
+              file=file)
+        for name, stats in sorted(self.stats.items(), key=lambda item: -item[1][2]):
+            if stats[0]:
+                print('%-42s %10d %12.4f %12.4f %14d' % (name, stats[0], stats[2], stats[3], stats[4]),
+                      file=file)
+
+    def key(self, name):
+        function = self.functions[name]
+        return (function.__code__.co_filename, function.__code__.co_firstlineno, name)
+
+    def create_stats(self):
+        """
+        Fill 'stats' in the format of cProfile.Profile, for pstats.Stats.
+        """
+        profile = {}
+        for name, (calls, primitive, own, cumulative, bases, callers) in self.stats.items():
+            if calls:
+                profile[self.key(name)] = (primitive, calls, own, cumulative, dict(
+                    (self.key(caller), (count, count, 0.0, 0.0))
+                    for caller, count in callers.items() if caller is not None))
+        return profile
+
+    def dump_stats(self, path):
+        """
+        Save the stats in the binary format of cProfile (e.g. for snakeviz,
+        or pstats.Stats(path).sort_stats('tottime').print_stats()).
+        """
+        pstats.Stats(ProfileStats(self.create_stats())).dump_stats(path)
+
+class ProfileStats(object):
+    """
+    Stand-in for a cProfile.Profile which pstats.Stats can load.
+    """
+    __slots__ = ('stats',)
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+# Sequence arguments counted as bases processed
+SEQUENCE_TYPES = (str, bytes, bytearray, memoryview, PackedGenome)
+# Number of leading symbols of a string which tell if it holds DNA
+BASES_SAMPLE = 64
+
+def Bases(argument):
+    """
+    Number of nucleotides in an argument: the length of a PackedGenome, or
+    of a string (or bytes-like view) whose first BASES_SAMPLE symbols are
+    all nucleotides. Other strings, e.g. paths, problem names or the line
+    holding k and d, are not DNA and count 0. Only a sample is checked, so a
+    genome is not read again for every call.
+    """
+    if isinstance(argument, PackedGenome):
+        return len(argument)
+    if not isinstance(argument, SEQUENCE_TYPES) or not len(argument):
+        return 0
+    sample = argument[:BASES_SAMPLE]
+    if isinstance(sample, str):
+        return 0 if sample.strip('ACGTacgt') else len(argument)
+    return 0 if bytes(sample).strip(b'ACGTacgt') else len(argument)
+
+def PackageModules():
+    """
+    The package and all its modules, which are imported if they were not yet.
+    """
+    package = importlib.import_module(__package__)
+    return [package] + [importlib.import_module('.' + module, __package__)
+                        for module in package.MODULES]
+
+def Instrument(names=None):
+    """
+    Start recording all functions of the package (or only the ones in
+    'names'). Returns the Instrumentation, call its stop() to unwrap them.
+    """
+    return Instrumentation().start(names)
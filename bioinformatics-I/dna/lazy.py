@@ -0,0 +1,34 @@
+# Optional dependencies which are imported only when they are first used.
+
+import importlib
+import importlib.util
+
+class LazyModule(object):
+    """
+    Stand-in for a module which imports it on the first attribute access, e.g.
+    NumPy is only imported when a function actually calls np.something. Code
+    which only checks 'np is None' does not import it.
+    """
+    __slots__ = ('name', 'module')
+
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+
+    def __getattr__(self, attribute):
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return getattr(self.module, attribute)
+
+    def __repr__(self):
+        return '<lazy module %r>' % self.name
+
+def Optional(name):
+    """
+    A LazyModule, or None if the module is not installed.
+    """
+    return LazyModule(name) if importlib.util.find_spec(name) is not None else None
+
+# NumPy is optional, without it the functions fall back to the plain Python
+# implementations
+np = Optional('numpy')
@@ -0,0 +1,240 @@
+# DNA strings packed into 2 bits per nucleotide.
+
+from .lazy import np
+from .week1 import KmerCodes, PatternToNumber, ReverseComplement
+from .hamming import PopCount
+
+# Translation of nucleotides to 2-bit codes, every other byte is left at 4
+PACKING_TABLE = bytearray([4] * 256)
+for code, nucleotide in enumerate('ACGT'):
+    PACKING_TABLE[ord(nucleotide)] = code
+    PACKING_TABLE[ord(nucleotide.lower())] = code
+PACKING_TABLE = bytes(PACKING_TABLE)
+# The 4 codes packed into every byte, in order, and the codes of its reverse
+# complement
+BYTE_CODES = [tuple((byte >> shift) & 3 for shift in (6, 4, 2, 0)) for byte in range(256)]
+BYTE_REVERSE_CODES = [tuple(3 - code for code in reversed(codes)) for codes in BYTE_CODES]
+BYTE_PATTERNS = [''.join(['ACGT'[code] for code in codes]) for codes in BYTE_CODES]
+# Number of nucleotides unpacked at once by PackedPatternMatching
+PACKED_CHUNK_SIZE = 2**20
+
+class PackedGenome(object):
+    """
+    A DNA string stored with 2 bits per nucleotide, i.e. 4 nucleotides per byte
+    (the first nucleotide in the highest bits), with the same code book as
+    PatternToNumber. Slices and reverse complements are views which share the
+    underlying bytearray, so they never copy the genome. A view is described
+    by its 'start' and 'length' in the bytearray, and by 'reverse' which tells
+    if it is read as the reverse complement of that interval.
+
+    PatternCount, PatternMatching, ApproximatePatternMatching and
+    CountWithMismatches accept a PackedGenome in place of a string Text (they
+    call its pattern_count(), pattern_matching() and
+    approximate_pattern_matching()), and compare k-mers as integers instead
+    of slicing the Text. The packed form is about memory, a quarter of a
+    string: queries unpack the view a chunk at a time (see
+    PackedPatternMatching). Without NumPy approximate matching rolls every
+    k-mer in Python, which is slower than on a str.
+    """
+    __slots__ = ('data', 'start', 'length', 'reverse')
+
+    def __init__(self, Text=''):
+        if isinstance(Text, str):
+            Text = Text.encode('ascii')
+        codes = bytes(Text).translate(PACKING_TABLE)
+        if codes and max(codes) > 3:
+            raise ValueError('Text contains symbols other than A, C, G and T')
+        codes += bytes(-len(codes) % 4)
+        self.data = bytearray(
+            (a << 6) | (b << 4) | (c << 2) | d
+            for a, b, c, d in zip(codes[0::4], codes[1::4], codes[2::4], codes[3::4])
+        )
+        self.start = 0
+        self.length = len(Text)
+        self.reverse = False
+
+    def view(self, start, length, reverse):
+        view = PackedGenome.__new__(PackedGenome)
+        view.data = self.data
+        view.start = start
+        view.length = length
+        view.reverse = reverse
+        return view
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            first, last, step = key.indices(self.length)
+            if step != 1:
+                raise ValueError('PackedGenome slices must be contiguous')
+            length = max(last - first, 0)
+            if self.reverse:
+                first = self.length - first - length
+            return self.view(self.start + first, length, self.reverse)
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError('PackedGenome index out of range')
+        return 'ACGT'[self.base(key)]
+
+    def __str__(self):
+        """
+        The view as a string, decoded one byte (4 nucleotides) at a time.
+        """
+        first = self.start & 3
+        Text = ''.join([BYTE_PATTERNS[byte] for byte in
+                        self.data[self.start >> 2:(self.start + self.length + 3) >> 2]])
+        Text = Text[first:first+self.length]
+        return ReverseComplement(Text) if self.reverse else Text
+
+    def __repr__(self):
+        return 'PackedGenome(%r)' % str(self)
+
+    def __eq__(self, other):
+        if isinstance(other, (PackedGenome, str)):
+            return len(self) == len(other) and str(self) == str(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def base(self, i):
+        """
+        Return the 2-bit code of the i-th nucleotide of the view.
+        """
+        if self.reverse:
+            position = self.start + self.length - 1 - i
+            return 3 - ((self.data[position >> 2] >> (6 - 2 * (position & 3))) & 3)
+        position = self.start + i
+        return (self.data[position >> 2] >> (6 - 2 * (position & 3))) & 3
+
+    def bases(self):
+        """
+        Generate the 2-bit codes of all nucleotides of the view, in order.
+        The data is read one byte (4 nucleotides) at a time, with the codes
+        of every byte looked up in BYTE_CODES, only the bytes at the ends of
+        the view are partial.
+        """
+        data = self.data
+        first, last = self.start, self.start + self.length
+        if first == last:
+            return
+        indices = range(first >> 2, ((last - 1) >> 2) + 1)
+        table = BYTE_REVERSE_CODES if self.reverse else BYTE_CODES
+        if self.reverse:
+            indices = reversed(indices)
+        for index in indices:
+            codes = table[data[index]]
+            low, high = max(first - 4 * index, 0), min(last - 4 * index, 4)
+            if self.reverse:
+                low, high = 4 - high, 4 - low
+            if high - low < 4:
+                codes = codes[low:high]
+            for code in codes:
+                yield code
+
+    def codes(self, i=0, length=None):
+        """
+        The 2-bit codes of 'length' nucleotides of the view from position i
+        (by default to the end), unpacked into a NumPy array of uint8 as from
+        EncodeGenome. Needs NumPy.
+        """
+        if length is None:
+            length = self.length - i
+        first = self.start + (self.length - i - length if self.reverse else i)
+        data = np.frombuffer(self.data, dtype=np.uint8)[first >> 2:(first + length + 3) >> 2]
+        codes = ((data[:, None] >> np.array([6, 4, 2, 0], dtype=np.uint8)) & 3).reshape(-1)
+        codes = codes[first & 3:(first & 3) + length]
+        return 3 - codes[::-1] if self.reverse else codes
+
+    def kmer(self, i, k):
+        """
+        Return the k-mer starting at position i as an integer, i.e. the same
+        number PatternToNumber would give for Text[i:i+k].
+        """
+        number = 0
+        for j in range(i, i + k):
+            number = (number << 2) | self.base(j)
+        return number
+
+    def kmers(self, k):
+        """
+        Generate the integer of every k-mer of the view, from left to right.
+        Every k-mer is computed from the previous one by shifting in the next
+        nucleotide, so nothing is allocated per position.
+        """
+        mask = (1 << 2 * k) - 1
+        number = 0
+        for i, base in enumerate(self.bases()):
+            number = ((number << 2) | base) & mask
+            if i >= k - 1:
+                yield number
+
+    def reverse_complement(self):
+        """
+        Return the reverse complement of the view, as a view of the same data.
+        """
+        return self.view(self.start, self.length, not self.reverse)
+
+    def pattern_count(self, Pattern):
+        return len(PackedPatternMatching(Pattern, self, 0))
+
+    def pattern_matching(self, Pattern):
+        return PackedPatternMatching(Pattern, self, 0)
+
+    def approximate_pattern_matching(self, Pattern, d):
+        return PackedPatternMatching(Pattern, self, d)
+
+def PackedHammingDistance(p, q, k):
+    """
+    Hamming distance between two k-mers given as integers. Every mismatching
+    nucleotide leaves at least one bit set in its 2-bit slot of p XOR q.
+    """
+    diff = p ^ q
+    diff = (diff | (diff >> 1)) & int('01' * k, 2)
+    return bin(diff).count('1')
+
+def PackedPatternMatching(Pattern, Genome, d):
+    """
+    All starting positions in a PackedGenome where 'Pattern' appears with at
+    most 'd' mismatches. With NumPy (and k up to 32) PACKED_CHUNK_SIZE
+    nucleotides are unpacked at a time and all their k-mer numbers are
+    compared with the Pattern at once, as in PackedHammingDistance. Without
+    NumPy exact matches are searched with str.find in decoded chunks, only
+    approximate matches roll every k-mer in Python.
+    """
+    k = len(Pattern)
+    positions = []
+    if k == 0 or k > len(Genome):
+        return positions
+    target = PatternToNumber(str(Pattern))
+    if np is not None and k <= 32:
+        low_bits = np.uint64(int('01' * k, 2))
+        for i in range(0, len(Genome) - k + 1, PACKED_CHUNK_SIZE):
+            codes = Genome.codes(i, min(PACKED_CHUNK_SIZE + k - 1, len(Genome) - i))
+            diff = KmerCodes(codes, k).view(np.uint64) ^ np.uint64(target)
+            if d:
+                matches = PopCount((diff | (diff >> np.uint64(1))) & low_bits) <= d
+            else:
+                matches = diff == 0
+            positions.extend((np.flatnonzero(matches) + i).tolist())
+        return positions
+    if not d:
+        Pattern = str(Pattern)
+        for i in range(0, len(Genome) - k + 1, PACKED_CHUNK_SIZE):
+            Text = str(Genome[i:i+PACKED_CHUNK_SIZE+k-1])
+            position = Text.find(Pattern)
+            while position != -1:
+                positions.append(i + position)
+                position = Text.find(Pattern, position + 1)
+        return positions
+    for i, number in enumerate(Genome.kmers(k)):
+        if number == target or (d and PackedHammingDistance(number, target, k) <= d):
+            positions.append(i)
+    return positions
@@ -0,0 +1,98 @@
+# Counting and clump finding over shards of a genome in a process pool.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .lazy import np
+from .week1 import BetterClumpFinding, FastComputingFrequencies, FrequencyTable
+
+# Smallest default shard, in nucleotides. Starting a pool costs about half a
+# second, more than counting a few million k-mers in this process, so smaller
+# genomes are not split at all.
+PARALLEL_MIN_SHARD_SIZE = 2**22
+
+def GenomeShards(Genome, shard_size, overlap):
+    """
+    Split a Genome into consecutive shards of 'shard_size' positions. Every
+    shard is extended by 'overlap' nucleotides of the next one, so that
+    k-mers (overlap k-1) or windows (overlap L-1) starting in a shard are
+    contained in it whole. Views from GenomeFile are decoded, since shards are
+    sent to other processes.
+    """
+    Shards = []
+    for start in range(0, max(len(Genome) - overlap, 1), shard_size):
+        Shard = Genome[start:start+shard_size+overlap]
+        if not isinstance(Shard, str):
+            Shard = bytes(Shard).decode('ascii')
+        Shards.append(Shard)
+    return Shards
+
+def ParallelMap(function, Genome, overlap, arguments, workers=None, shard_size=None):
+    """
+    Run function(shard, *arguments) on every shard of the Genome in a pool of
+    'workers' processes (by default one per CPU) and yield the results in
+    the order of the shards, as they come back, so the caller can merge each
+    one and let it go. By default the Genome is split evenly among the
+    workers, but no shard is smaller than PARALLEL_MIN_SHARD_SIZE. With a
+    single worker or a single shard nothing is started and the function runs
+    in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if shard_size is None:
+        shard_size = max(-(-(len(Genome) - overlap) // workers), overlap + 1,
+                         PARALLEL_MIN_SHARD_SIZE)
+    Shards = GenomeShards(Genome, shard_size, overlap)
+    if workers == 1 or len(Shards) == 1:
+        for Shard in Shards:
+            yield function(Shard, *arguments)
+        return
+    columns = [[argument] * len(Shards) for argument in arguments]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(function, Shards, *columns):
+            yield result
+
+def ParallelComputingFrequencies(Text, k, workers=None, shard_size=None):
+    """
+    FastComputingFrequencies over shards overlapping by k-1 nucleotides, so
+    every k-mer is counted by exactly one shard. The frequency array of every
+    shard is added in place to the total as soon as it comes back, so no
+    more than one extra 4**k array is needed for the merge.
+    """
+    FrequencyArray = None
+    for ShardArray in ParallelMap(FastComputingFrequencies, Text, k - 1, (k,), workers, shard_size):
+        if FrequencyArray is None:
+            FrequencyArray = ShardArray
+        elif np is not None:
+            FrequencyArray += ShardArray
+        else:
+            for i, count in enumerate(ShardArray):
+                FrequencyArray[i] += count
+    return FrequencyArray
+
+def ParallelFrequentWords(Text, k, workers=None, shard_size=None):
+    """
+    BetterFrequentWords with the frequency tables of the shards (overlapping
+    by k-1 nucleotides) merged into one.
+    """
+    FreqMap = {}
+    for ShardMap in ParallelMap(FrequencyTable, Text, k - 1, (k,), workers, shard_size):
+        for Pattern, count in ShardMap.items():
+            FreqMap[Pattern] = FreqMap.get(Pattern, 0) + count
+    maxCount = max(FreqMap.values())
+    return [Pattern for Pattern in FreqMap if FreqMap[Pattern] == maxCount]
+
+def ParallelClumpFinding(Genome, k, L, t, workers=None, shard_size=None):
+    """
+    BetterClumpFinding over shards overlapping by L-1 nucleotides, so every
+    window of length L lies whole in the shard where it starts. Clumps are
+    merged in the order of the shards, which gives the same list as running
+    BetterClumpFinding over the whole Genome.
+    """
+    clump = []
+    found = set()
+    for ShardClump in ParallelMap(BetterClumpFinding, Genome, L - 1, (k, L, t), workers, shard_size):
+        for Pattern in ShardClump:
+            if Pattern not in found:
+                found.add(Pattern)
+                clump.append(Pattern)
+    return clump
@@ -0,0 +1,142 @@
+# Top-N, threshold and histogram queries over the counts of k-mers.
+
+import heapq
+
+from .lazy import np
+from .week1 import (
+    CanonicalNumbers, FastComputingFrequencies, FREQUENCY_ARRAY_MAX_K,
+    FrequencyTable, NumberToPattern, NumbersToPatterns, PatternsToNumbers,
+    SortedKmerCounts
+)
+
+# Number of k-mers decoded at a time when the answer of a query is streamed
+QUERY_CHUNK_SIZE = 2**16
+
+class KmerCounts(object):
+    """
+    Counts of the k-mers of a genome, answering queries without decoding
+    (or sorting) all of them: only the k-mers in the answer are turned into
+    strings, e.g. the top 100 9-mers are found with np.argpartition over
+    the 4**9 counts and only those 100 are sorted and decoded.
+
+    'counts' is either a frequency array (as from FastComputingFrequencies,
+    CountCache or KmerAccumulator), together with 'numbers' the counts of
+    the k-mers with these numbers (as from SortedKmerCounts), or a frequency
+    table {Pattern : count} (as from FrequencyTable). Without NumPy, or for k
+    above 32, everything is kept in a frequency table.
+    """
+    __slots__ = ('k', 'numbers', 'counts')
+
+    def __init__(self, counts, k, numbers=None):
+        self.k = k
+        self.numbers = numbers
+        if np is None:
+            if not isinstance(counts, dict):
+                counts = dict((NumberToPattern(int(number), k), count)
+                              for number, count in zip(numbers or range(len(counts)), counts)
+                              if count)
+        elif isinstance(counts, dict) and k <= 32:
+            Patterns = sorted(counts)
+            # the numbers of sorted k-mers are sorted too
+            self.numbers = PatternsToNumbers(Patterns)
+            counts = np.array([counts[Pattern] for Pattern in Patterns], dtype=np.int64)
+        elif not isinstance(counts, dict):
+            counts = np.asarray(counts)
+        self.counts = counts
+
+    def patterns(self, indices):
+        """
+        The k-mers at the given indices of 'counts'.
+        """
+        return NumbersToPatterns(indices if self.numbers is None else self.numbers[indices], self.k)
+
+    def top(self, N):
+        """
+        The N most frequent k-mers of the genome as (Pattern, count), the
+        largest count first and equal counts in lexicographic order. The N-th
+        largest count is found by partitioning, so only the k-mers above it
+        (and enough of the ones equal to it) are sorted and decoded.
+        """
+        if N <= 0:
+            return []
+        if isinstance(self.counts, dict):
+            return heapq.nsmallest(N, self.counts.items(), key=lambda item: (-item[1], item[0]))
+        counts = self.counts
+        if len(counts) == 0:
+            return []
+        if N < len(counts):
+            threshold = counts[np.argpartition(counts, len(counts) - N)[len(counts) - N]]
+        else:
+            threshold = counts.min()
+        # k-mers which do not appear in the genome are never part of the answer
+        threshold = max(threshold, 1)
+        above = np.flatnonzero(counts > threshold)
+        equal = np.flatnonzero(counts == threshold)[:N - len(above)]
+        indices = np.concatenate((above, equal))
+        # indices follow the order of the k-mers, so they break ties
+        indices = indices[np.lexsort((indices, -counts[indices]))]
+        return list(zip(self.patterns(indices), counts[indices].tolist()))
+
+    def at_least(self, t):
+        """
+        Yield (Pattern, count) for every k-mer which appears at least t times
+        (and at least once) in the genome, in lexicographic order, e.g. the
+        candidates of an (L,t)-clump within one window. The k-mers are
+        decoded QUERY_CHUNK_SIZE at a time.
+        """
+        t = max(t, 1)
+        if isinstance(self.counts, dict):
+            for Pattern in sorted(self.counts):
+                if self.counts[Pattern] >= t:
+                    yield Pattern, self.counts[Pattern]
+            return
+        indices = np.flatnonzero(self.counts >= t)
+        for start in range(0, len(indices), QUERY_CHUNK_SIZE):
+            chunk = indices[start:start+QUERY_CHUNK_SIZE]
+            for Pattern, count in zip(self.patterns(chunk), self.counts[chunk].tolist()):
+                yield Pattern, count
+
+    def histogram(self):
+        """
+        Entry c is the number of distinct k-mers which appear exactly c times
+        in the genome. For a frequency array entry 0 counts the k-mers which
+        do not appear at all, otherwise it is 0.
+        """
+        if isinstance(self.counts, dict):
+            histogram = [0] * (max(self.counts.values(), default=0) + 1)
+            for count in self.counts.values():
+                histogram[count] += 1
+            return histogram
+        return np.bincount(self.counts)
+
+    def frequent_words(self):
+        """
+        The k-mers with the largest count, as FrequentWords.
+        """
+        if isinstance(self.counts, dict):
+            maxCount = max(self.counts.values(), default=0)
+        else:
+            maxCount = self.counts.max() if len(self.counts) else 0
+        return [Pattern for Pattern, count in self.at_least(maxCount)]
+
+def CountKmers(Text, k, canonical=False):
+    """
+    Count the k-mers of Text once, for any number of queries. The counts are
+    kept the way FindFrequentWords would count them: a frequency array for
+    small k, sorted k-mer numbers for k up to 32, otherwise (or without
+    NumPy) a frequency table.
+    """
+    if np is None or k > 32:
+        if not isinstance(Text, str):
+            Text = bytes(Text).decode('ascii')
+        if not canonical:
+            return KmerCounts(FrequencyTable(Text, k), k)
+        FreqMap = {}
+        for number in CanonicalNumbers(Text, k):
+            Pattern = NumberToPattern(number, k)
+            FreqMap[Pattern] = FreqMap.get(Pattern, 0) + 1
+        return KmerCounts(FreqMap, k)
+    if k <= FREQUENCY_ARRAY_MAX_K and 4**k <= len(Text)-k+1:
+        return KmerCounts(FastComputingFrequencies(Text, k, canonical), k)
+    numbers, counts = SortedKmerCounts(Text, k, canonical)
+    return KmerCounts(counts, k, numbers)
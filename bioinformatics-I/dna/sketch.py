@@ -0,0 +1,248 @@
+# Approximate k-mer counts in fixed memory, for large k and many genomes.
+
+import math
+
+from .lazy import np
+from .week1 import EncodeGenome, KmerCodes, NumbersToPatterns, RunLengths
+from .query import KmerCounts
+
+# Default size of a Count-Min Sketch: 'depth' rows of 'width' counters
+SKETCH_WIDTH = 2**22
+SKETCH_DEPTH = 4
+# Default number of hash functions of the Bloom filter of a sketch
+BLOOM_HASHES = 3
+# Number of k-mers hashed at once
+SKETCH_CHUNK_SIZE = 2**20
+
+def HashFunctions(count, seed):
+    """
+    Random odd multipliers and increments of 'count' multiply-shift hash
+    functions of uint64 numbers.
+    """
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(0, 2**64, size=count, dtype=np.uint64) | np.uint64(1)
+    increments = rng.integers(0, 2**64, size=count, dtype=np.uint64)
+    return multipliers, increments
+
+def HashNumbers(numbers, multipliers, increments, size):
+    """
+    Row i holds the i-th hash function of every number, from 0 to size - 1:
+    the high bits of a * number + b (modulo 2**64).
+    """
+    hashed = numbers[None, :] * multipliers[:, None] + increments[:, None]
+    return ((hashed >> np.uint64(32)) % np.uint64(size)).astype(np.int64)
+
+def KmerChunks(Genome, k, canonical=False, chunk_size=SKETCH_CHUNK_SIZE):
+    """
+    Yield (position, numbers): the uint64 numbers of 'chunk_size' k-mers of
+    the Genome at a time (k up to 32), the first of them at 'position'. With
+    'canonical' every k-mer is numbered as the smaller of it and its reverse
+    complement.
+    """
+    if k > 32:
+        raise ValueError('k-mers are hashed as uint64, so k must be at most 32')
+    for start in range(0, max(len(Genome) - k + 1, 0), chunk_size):
+        Codes = EncodeGenome(Genome[start:start+chunk_size+k-1])
+        numbers = KmerCodes(Codes, k).view(np.uint64)
+        if canonical:
+            numbers = np.minimum(numbers, KmerCodes(3 - Codes[::-1], k)[::-1].view(np.uint64))
+        yield start, numbers
+
+class BloomFilter(object):
+    """
+    Set of uint64 numbers in 'bits' bits, with 'hashes' hash functions. It
+    answers 'maybe' or 'certainly not': a number which was added is always
+    found, one which was not is found with a small probability.
+    """
+    __slots__ = ('bits', 'multipliers', 'increments', 'array')
+
+    def __init__(self, bits, hashes=BLOOM_HASHES, seed=1):
+        self.bits = bits
+        self.multipliers, self.increments = HashFunctions(hashes, seed)
+        self.array = np.zeros(-(-bits // 8), dtype=np.uint8)
+
+    def add(self, numbers):
+        for hashed in HashNumbers(numbers, self.multipliers, self.increments, self.bits):
+            np.bitwise_or.at(self.array, hashed >> 3, (1 << (hashed & 7)).astype(np.uint8))
+
+    def contains(self, numbers):
+        found = np.ones(len(numbers), dtype=bool)
+        for hashed in HashNumbers(numbers, self.multipliers, self.increments, self.bits):
+            found &= (self.array[hashed >> 3] >> (hashed & 7)).astype(bool)
+        return found
+
+class CountMinSketch(object):
+    """
+    Approximate counts of k-mers (k up to 32) in depth * width counters,
+    however many distinct k-mers the genomes have. Every k-mer is added to
+    one counter in every row, chosen by the hash function of the row, and
+    its estimate is the smallest of these counters. Other k-mers can only
+    add to a counter, so an estimate is never below the true count, and
+    with probability 1 - exp(-depth) it is at most error_bound() above it.
+
+    With 'bloom_bits' the first occurrence of every k-mer only goes into a
+    Bloom filter of that many bits, and only later ones are counted, so the
+    k-mers seen once (most of them, for large k) take no room in the sketch.
+    A k-mer which is not in the filter was never seen, one which is gets
+    its counters plus one. Needs NumPy.
+    """
+    __slots__ = ('width', 'depth', 'multipliers', 'increments', 'table', 'total', 'bloom')
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, bloom_bits=None, seed=0):
+        if np is None:
+            raise ImportError('CountMinSketch needs NumPy')
+        self.width = width
+        self.depth = depth
+        self.multipliers, self.increments = HashFunctions(depth, seed)
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self.bloom = BloomFilter(bloom_bits, seed=seed + 1) if bloom_bits else None
+
+    def update(self, numbers, counts=None):
+        """
+        Add the k-mers with the given numbers (or the distinct numbers, each
+        'counts' times).
+        """
+        numbers = np.asarray(numbers, dtype=np.uint64)
+        if self.bloom is not None:
+            if counts is None:
+                numbers, counts = np.unique(numbers, return_counts=True)
+            seen = self.bloom.contains(numbers)
+            self.bloom.add(numbers[~seen])
+            counts = counts - ~seen
+            numbers, counts = numbers[counts > 0], counts[counts > 0]
+        for row, hashed in enumerate(self.hashes(numbers)):
+            self.table[row] += np.bincount(hashed, counts, minlength=self.width).astype(np.int64)
+        self.total += len(numbers) if counts is None else int(np.sum(counts))
+
+    def add(self, Genome, k, canonical=False):
+        """
+        Count all k-mers of a Genome, e.g. a GenomeFile view, in chunks.
+        """
+        for start, numbers in KmerChunks(Genome, k, canonical):
+            self.update(numbers)
+
+    def hashes(self, numbers):
+        return HashNumbers(numbers, self.multipliers, self.increments, self.width)
+
+    def estimate(self, numbers):
+        """
+        Estimated counts of the k-mers with the given numbers, never below
+        the true counts.
+        """
+        numbers = np.asarray(numbers, dtype=np.uint64)
+        estimates = np.full(len(numbers), np.iinfo(np.int64).max, dtype=np.int64)
+        for row, hashed in enumerate(self.hashes(numbers)):
+            np.minimum(estimates, self.table[row][hashed], out=estimates)
+        if self.bloom is not None:
+            estimates = np.where(self.bloom.contains(numbers), estimates + 1, 0)
+        return estimates
+
+    def error_bound(self):
+        """
+        An estimate exceeds the true count by at most this many, with
+        probability confidence() (e / width of all counted k-mers).
+        """
+        return math.e / self.width * self.total
+
+    def confidence(self):
+        return 1 - math.exp(-self.depth)
+
+    def max_estimate(self, Genomes, k, canonical=False):
+        """
+        The largest estimate of a k-mer of the Genomes, at least the largest
+        true count.
+        """
+        maxEstimate = 0
+        for Genome in Genomes:
+            for start, numbers in KmerChunks(Genome, k, canonical):
+                maxEstimate = max(maxEstimate, int(self.estimate(numbers).max()))
+        return maxEstimate
+
+    def candidate_counts(self, Genomes, k, t, canonical=False):
+        """
+        Another pass over the Genomes which takes every k-mer estimated at
+        least t times as a candidate and counts the candidates exactly.
+        Returns their numbers (in increasing order) and exact counts. The
+        estimates never fall below the true counts, so every k-mer which
+        appears at least t times is a candidate.
+        """
+        runs = []
+        for Genome in Genomes:
+            for start, numbers in KmerChunks(Genome, k, canonical):
+                runs.append(RunLengths(np.sort(numbers[self.estimate(numbers) >= t])))
+        if not runs:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+        numbers = np.concatenate([numbers for numbers, counts in runs])
+        order = np.argsort(numbers, kind='stable')
+        counts = np.concatenate([counts for numbers, counts in runs])[order]
+        return RunLengths(numbers[order], counts)
+
+    def heavy_hitters(self, Genomes, k, t, canonical=False):
+        """
+        The k-mers which appear at least t times in the Genomes, with their
+        exact counts, as KmerCounts (e.g. for top() or at_least()).
+        """
+        numbers, counts = self.candidate_counts(Genomes, k, t, canonical)
+        return KmerCounts(counts[counts >= t], k, numbers[counts >= t])
+
+def SketchGenomes(Genomes, k, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, bloom_bits=None,
+                  canonical=False):
+    sketch = CountMinSketch(width, depth, bloom_bits)
+    for Genome in Genomes:
+        sketch.add(Genome, k, canonical)
+    return sketch
+
+def SketchFrequentWords(Genomes, k, sketch=None, canonical=False):
+    """
+    The most frequent k-mers of all Genomes together (k up to 32), exactly,
+    with memory for the sketch and the candidates only. The largest
+    estimate M is at least the largest count: the k-mers estimated at M are
+    counted exactly, and if none of them really appears M times, the largest
+    count found among them is a lower bound of the answer, and the k-mers
+    estimated at or above it are counted exactly.
+    """
+    Genomes = list(Genomes)
+    if sketch is None:
+        sketch = SketchGenomes(Genomes, k, canonical=canonical)
+    t = sketch.max_estimate(Genomes, k, canonical)
+    if t == 0:
+        return []
+    numbers, counts = sketch.candidate_counts(Genomes, k, t, canonical)
+    if counts.max() < t:
+        numbers, counts = sketch.candidate_counts(Genomes, k, int(counts.max()), canonical)
+    return KmerCounts(counts, k, numbers).frequent_words()
+
+def SketchClumpFinding(Genome, k, L, t, sketch=None):
+    """
+    The k-mers forming (L,t)-clumps in the Genome, in the order
+    BetterClumpFinding finds them. A k-mer in a clump appears at least t
+    times in the Genome, so only the heavy hitters of the sketch are
+    candidates. The positions of the candidates are collected in another
+    pass, and a candidate forms a clump if t of its consecutive occurrences
+    fit into L nucleotides.
+    """
+    if len(Genome) < L:
+        return []
+    if sketch is None:
+        sketch = SketchGenomes([Genome], k)
+    candidates = sketch.heavy_hitters([Genome], k, t).numbers
+    numbers, positions = [], []
+    for start, chunk in KmerChunks(Genome, k):
+        found = np.flatnonzero(np.isin(chunk, candidates))
+        numbers.append(chunk[found])
+        positions.append(found + start)
+    if not numbers:
+        return []
+    numbers = np.concatenate(numbers)
+    # stable, so the positions of every k-mer stay in increasing order
+    order = np.argsort(numbers, kind='stable')
+    numbers, positions = numbers[order], np.concatenate(positions)[order]
+    if len(numbers) < t:
+        return []
+    clumps = ((numbers[t-1:] == numbers[:len(numbers)-t+1])
+              & (positions[t-1:] - positions[:len(numbers)-t+1] <= L - k))
+    # the first clump of every k-mer is found once its t-th occurrence is added
+    ends, numbers = positions[t-1:][clumps], numbers[t-1:][clumps]
+    numbers, first = np.unique(numbers, return_index=True)
+    return NumbersToPatterns(numbers[np.argsort(ends[first])], k)
@@ -0,0 +1,497 @@
+# Week 1: counting k-mers, frequent words, reverse complements and clumps.
+
+from .lazy import np
+
+# Problem: Count the number of occurences of a Pattern within a Text. This is a
+#          sliding window problem, so it should count overlapping occurences.
+# Input: String Text and Pattern
+# Output: Count(Text, Pattern)
+def PatternCount(Text, Pattern):
+    # a PackedGenome or GenomeIndex answers the query itself
+    if hasattr(Text, 'pattern_count'):
+        return Text.pattern_count(Pattern)
+    if not isinstance(Text, str) and isinstance(Pattern, str):
+        Pattern = Pattern.encode('ascii')
+    count = 0
+    n = len(Text)
+    k = len(Pattern)
+    # or for i in range(n - k): ? there is no +1 in original algorithm
+    # it does not count the last pattern! So it wont work! Look at the
+    # debug datasets file.
+    for i in range(n-k+1):
+        if Text[i:i+k] == Pattern:
+            count += 1
+    return count
+
+# Problem: Find the most frequent k-mers in a string
+# Input: A string Text and an integer k
+# Output: All most frequent k-mers in Text
+def CountDict(Text, k):
+    """
+    The index in the count array corresponds to the position of the i-th pattern
+    in a text.
+    """
+    Count = {}
+    for i in range(len(Text)-k+1):
+        Pattern = Text[i:i+k]
+        Count[i] = PatternCount(Text, Pattern)
+    return Count
+
+def RemoveDuplicates(Words):
+    """
+    Remove duplicates from the Words array. Return array where every word is
+    unique.
+    """
+    UniqueWords = []
+    for word in Words:
+        if word not in UniqueWords:
+            UniqueWords.append(word)
+    return UniqueWords
+
+# Charging station - The Frequency Array:
+
+# Tables for converting k-mers to and from numbers, built once. Every byte maps
+# to its base-4 digit ('x' for anything other than A, C, G and T, which int()
+# then rejects), and every hexadecimal digit of a number to the two
+# nucleotides of its 4 bits.
+BASE4_DIGITS = bytes(b'ACGT'.index(byte) + ord('0') if byte in b'ACGT' else ord('x')
+                     for byte in range(256))
+HEX_NUCLEOTIDES = str.maketrans(dict(
+    ('%x' % digit, 'ACGT'[digit >> 2] + 'ACGT'[digit & 3]) for digit in range(16)))
+# 2-bit code of every byte (255 for anything other than A, C, G and T, in
+# either case), see EncodeGenome
+NUCLEOTIDE_TABLE = bytes(b'ACGT'.index(byte) if byte in b'ACGT'
+                         else b'acgt'.index(byte) if byte in b'acgt' else 255
+                         for byte in range(256))
+
+def PatternToNumber(Pattern):
+    """
+    Read the Pattern as a base-4 number (A=0, C=1, G=2, T=3): translate every
+    nucleotide into its digit with one table lookup and let int() do the
+    arithmetic.
+    """
+    if not Pattern:
+        return 0
+    if isinstance(Pattern, str):
+        Pattern = Pattern.encode('ascii')
+    return int(bytes(Pattern).translate(BASE4_DIGITS), 4)
+
+def NumberToPattern(index, k):
+    """
+    Convert a number from a base-10 to a string of characters from a 4-letter
+    alphabet. That is, from a base-10 number to a base-4 'number'. If the
+    result is less than k signs long, it is padded (with zeroes), e.g. if
+    NumberToPattern([some_number], 3) = G, two 'A's are added in front of it
+    i.e. AAG is the resulting pattern. Every hexadecimal digit of the number
+    holds two nucleotides, so the number is formatted in hex, padded to
+    (k + 1) // 2 digits and translated; an odd k drops the extra leading 'A'.
+    An index which does not fit into k nucleotides raises a ValueError.
+    """
+    if index < 0 or index >> (2 * k):
+        raise ValueError('%d is not the number of a %d-mer' % (index, k))
+    Pattern = ('%0*x' % ((k + 1) // 2, index)).translate(HEX_NUCLEOTIDES)
+    return Pattern[len(Pattern) - k:]
+
+def PatternsToNumbers(Patterns):
+    """
+    PatternToNumber of a whole list of k-mers (k up to 32) in one call, as an
+    array of uint64 (a list without NumPy). All k-mers are encoded together
+    and the numbers built one column of nucleotides at a time.
+    """
+    Patterns = list(Patterns)
+    k = len(Patterns[0]) if Patterns else 0
+    if k > 32 or any(len(Pattern) != k for Pattern in Patterns):
+        raise ValueError('all k-mers must have the same length k <= 32')
+    if np is None:
+        return [PatternToNumber(Pattern) for Pattern in Patterns]
+    numbers = np.zeros(len(Patterns), dtype=np.uint64)
+    if Patterns and k:
+        Joined = ''.join(Patterns) if isinstance(Patterns[0], str) else b''.join(Patterns)
+        Codes = EncodeGenome(Joined).reshape(len(Patterns), k)
+        for j in range(k):
+            numbers <<= np.uint64(2)
+            numbers |= Codes[:, j]
+    return numbers
+
+def NumbersToPatterns(numbers, k):
+    """
+    NumberToPattern of a whole array of numbers in one call. The 2-bit codes
+    of all k-mers are extracted with shifts and masks into one matrix, looked
+    up as letters and decoded as a single string, which is then cut into
+    k-mers.
+    """
+    if np is None or k == 0:
+        return [NumberToPattern(int(number), k) for number in numbers]
+    numbers = np.asarray(numbers)
+    if len(numbers) and (numbers.min() < 0 or (k < 32 and numbers.max() >= 4**k)):
+        raise ValueError('numbers of %d-mers must be from 0 to 4**%d - 1' % (k, k))
+    numbers = numbers.astype(np.uint64, copy=False)
+    shifts = np.arange(2 * (k - 1), -1, -2, dtype=np.uint64)
+    Codes = (numbers[:, None] >> shifts) & np.uint64(3)
+    Text = np.frombuffer(b'ACGT', dtype=np.uint8)[Codes].tobytes().decode('ascii')
+    return [Text[i:i+k] for i in range(0, len(Text), k)]
+
+def ComputingFrequencies(Text, k, canonical=False):
+    FrequencyArray = {}
+    for i in range(4**k):
+        FrequencyArray[i] = 0
+    # Alternatively: [0] * (4**k) = [0, ..., 0] where len([given_list]) = 4**k
+    if canonical:
+        for j in CanonicalNumbers(Text, k):
+            FrequencyArray[j] += 1
+        return FrequencyArray
+    for i in range(len(Text)-k+1):
+        Pattern = Text[i:i+k]
+        j = PatternToNumber(Pattern)
+        FrequencyArray[j] += 1
+    return FrequencyArray
+
+# Canonical k-mers: a k-mer and its reverse complement are the same site read
+# from the other strand, so both are counted as the smaller of the two numbers
+# (which is also the lexicographically smaller string).
+NUCLEOTIDE_CODES = {
+    'A' : 0, 'C' : 1, 'G' : 2, 'T' : 3,
+    ord('A') : 0, ord('C') : 1, ord('G') : 2, ord('T') : 3,
+}
+
+def CanonicalNumbers(Text, k):
+    """
+    Yield min(PatternToNumber(Pattern), PatternToNumber(ReverseComplement(Pattern)))
+    for every k-mer Pattern of Text, in a single pass. The forward number is
+    shifted left and gets the next nucleotide at the end, the reverse
+    complement number is shifted right and gets its complement at the front.
+    """
+    mask = 4**k - 1
+    shift = 2 * (k - 1)
+    forward = reverse = 0
+    for i, nucleotide in enumerate(Text):
+        code = NUCLEOTIDE_CODES[nucleotide]
+        forward = ((forward << 2) | code) & mask
+        reverse = (reverse >> 2) | ((3 - code) << shift)
+        if i >= k - 1:
+            yield min(forward, reverse)
+
+# Vectorized frequency array. NumPy is optional (and only imported once it is
+# used, see lazy.py), without it the functions below fall back to the plain
+# Python implementations.
+
+def EncodeGenome(Text):
+    """
+    Encode a DNA string once into an array of 2-bit codes (A=0, C=1, G=2, T=3),
+    one uint8 per nucleotide, the same code book as in PatternToNumber. Bytes
+    and memoryviews (e.g. from GenomeFile) are read in place, without a copy.
+    """
+    if isinstance(Text, str):
+        Text = Text.encode('ascii')
+    table = np.frombuffer(NUCLEOTIDE_TABLE, dtype=np.uint8)
+    encoded = table[np.frombuffer(Text, dtype=np.uint8)]
+    if (encoded == 255).any():
+        raise ValueError('Text contains symbols other than A, C, G and T')
+    return encoded
+
+def KmerCodes(Codes, k):
+    """
+    Compute PatternToNumber of every k-mer in an encoded genome. The number of
+    each k-mer is built as a rolling integer, i.e. shifted by two bits and the
+    next nucleotide added, for all positions at once. Works for k up to 31.
+    """
+    n = len(Codes) - k + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    numbers = np.zeros(n, dtype=np.int64)
+    for j in range(k):
+        numbers <<= 2
+        numbers |= Codes[j:j+n]
+    return numbers
+
+def FastComputingFrequencies(Text, k, canonical=False):
+    """
+    Same frequency array as ComputingFrequencies, but counted with np.bincount
+    over the k-mer numbers of the whole Text. Returns a list of 4**k counts
+    (a NumPy array when NumPy is available). With 'canonical' the numbers of
+    the reverse complement strand are computed too, read backwards so that
+    they line up with the forward k-mers, and the smaller one is counted.
+    """
+    if np is None:
+        if not isinstance(Text, str):
+            Text = bytes(Text).decode('ascii')
+        return list(ComputingFrequencies(Text, k, canonical).values())
+    Codes = EncodeGenome(Text)
+    numbers = KmerCodes(Codes, k)
+    if canonical:
+        numbers = np.minimum(numbers, KmerCodes(3 - Codes[::-1], k)[::-1])
+    return np.bincount(numbers, minlength=4**k)
+
+def FasterFrequentWords(Text, k, canonical=False):
+    """
+    Find frequent words using a frequency array. This algorithm is faster for
+    smaller values of k. With 'canonical' a k-mer and its reverse complement
+    are counted together, under the smaller of the two.
+    """
+    FrequencyArray = FastComputingFrequencies(Text, k, canonical)
+    maxCount = FrequencyArray.max() if np is not None else max(FrequencyArray)
+    # a Text shorter than k has no k-mers at all
+    if maxCount == 0:
+        return []
+    if np is not None:
+        indices = np.flatnonzero(FrequencyArray == maxCount)
+    else:
+        indices = [i for i in range(4**k) if FrequencyArray[i] == maxCount]
+    return NumbersToPatterns(indices, k)
+
+def FrequencyTable(Text, k):
+    """
+    Count every k-mer of a Text in a single pass. Only k-mers which actually
+    appear in the Text are stored, so the size of the table does not depend on
+    4**k.
+    """
+    # k-mers of a GenomeFile view would be memoryview keys, so count strings
+    if not isinstance(Text, str):
+        Text = bytes(Text).decode('ascii')
+    FreqMap = {}
+    for i in range(len(Text)-k+1):
+        Pattern = Text[i:i+k]
+        FreqMap[Pattern] = FreqMap.get(Pattern, 0) + 1
+    return FreqMap
+
+def BetterFrequentWords(Text, k):
+    """
+    Find frequent words using a frequency table (hash map) of k-mers. Unlike
+    FrequentWords it does not call PatternCount for every position, so it runs
+    in a single pass over the Text and works for any k.
+    """
+    FrequentPatterns = []
+    FreqMap = FrequencyTable(Text, k)
+    maxCount = max(FreqMap.values())
+    for Pattern in FreqMap:
+        if FreqMap[Pattern] == maxCount:
+            FrequentPatterns.append(Pattern)
+    return FrequentPatterns
+
+def SortedFrequentWords(Text, k, canonical=False):
+    """
+    Find frequent words by sorting: sort the numbers of all k-mers, so equal
+    k-mers end up next to each other, and count the length of every run.
+    Unlike the frequency array it only needs memory for the k-mers of the
+    Text, so it works for any k up to 32 (the numbers are uint64). Without
+    NumPy the k-mers are sorted as strings.
+    """
+    if np is None:
+        if not isinstance(Text, str):
+            Text = bytes(Text).decode('ascii')
+        if canonical:
+            Patterns = sorted(NumberToPattern(number, k) for number in CanonicalNumbers(Text, k))
+        else:
+            Patterns = sorted(Text[i:i+k] for i in range(len(Text)-k+1))
+        FrequentPatterns = []
+        maxCount = 0
+        i = 0
+        while i < len(Patterns):
+            j = i
+            while j < len(Patterns) and Patterns[j] == Patterns[i]:
+                j += 1
+            if j - i > maxCount:
+                maxCount = j - i
+                FrequentPatterns = []
+            if j - i == maxCount:
+                FrequentPatterns.append(Patterns[i])
+            i = j
+        return FrequentPatterns
+    numbers, counts = SortedKmerCounts(Text, k, canonical)
+    if len(counts) == 0:
+        return []
+    return NumbersToPatterns(numbers[counts == counts.max()], k)
+
+def SortedKmerCounts(Text, k, canonical=False):
+    """
+    The distinct k-mer numbers of Text in increasing order (uint64, k up to
+    32) and how many times each appears, by sorting. Needs NumPy.
+    """
+    if k > 32:
+        raise ValueError('SortedFrequentWords works for k up to 32')
+    Codes = EncodeGenome(Text)
+    # for k = 32 the int64 numbers wrap around, as uint64 they are exact
+    numbers = KmerCodes(Codes, k).view(np.uint64)
+    if canonical:
+        numbers = np.minimum(numbers, KmerCodes(3 - Codes[::-1], k)[::-1].view(np.uint64))
+    return RunLengths(np.sort(numbers))
+
+def RunLengths(numbers, counts=None):
+    """
+    Distinct values of a sorted NumPy array and how many times each appears
+    (or the sum of their 'counts', if given).
+    """
+    if len(numbers) == 0:
+        return numbers, np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], numbers[1:] != numbers[:-1])))
+    if counts is None:
+        return numbers[starts], np.diff(np.append(starts, len(numbers)))
+    return numbers[starts], np.add.reduceat(counts, starts)
+
+# Largest k for which the frequency array (4**k entries) is still considered
+FREQUENCY_ARRAY_MAX_K = 12
+
+def FindFrequentWords(Text, k):
+    """
+    Pick the frequent words algorithm depending on k and the length of the
+    Text. The frequency array pays for all 4**k possible k-mers, so it only
+    pays off when k is small and the Text has at least as many k-mers as there
+    are entries in the array. Otherwise the k-mers are sorted, or the
+    frequency table is used when NumPy is missing or k is above 32.
+    """
+    if k <= FREQUENCY_ARRAY_MAX_K and 4**k <= len(Text)-k+1:
+        return FasterFrequentWords(Text, k)
+    if np is not None and k <= 32:
+        return SortedFrequentWords(Text, k)
+    return BetterFrequentWords(Text, k)
+
+def FrequentWords(Text, k, canonical=False):
+    """
+    Take every k-mer from a text, and count the number of its occurences in the
+    text. Find the maximum occuring kmers and, according to their indices, form
+    an array of frequent patterns. Remove any duplicates and return the array.
+    With 'canonical' the canonical k-mers are counted in one pass instead (see
+    CanonicalNumbers).
+    """
+    # Why does it fails the debug dataset 2? See: FrequentWordsProblem.pdf
+    if canonical:
+        # keyed by the canonical number, so only k-mers of the Text are stored
+        Count = {}
+        for number in CanonicalNumbers(Text, k):
+            Count[number] = Count.get(number, 0) + 1
+        maxCount = max(Count.values())
+        return [NumberToPattern(i, k) for i in sorted(Count) if Count[i] == maxCount]
+    FrequentPatterns = []
+    Count = CountDict(Text, k)
+    maxCount = max(Count.values())
+    for i in Count:
+        if Count[i] == maxCount:
+            FrequentPatterns.append(Text[i:i+k])
+    FrequentPatternsWithoutDuplicates = RemoveDuplicates(FrequentPatterns)
+    return FrequentPatternsWithoutDuplicates
+
+def FrequentWordsWithDuplicates(Text, k):
+    FrequentPatterns = []
+    Count = CountDict(Text, k)
+    maxCount = max(Count.values())
+    for i in Count:
+        if Count[i] == maxCount:
+            FrequentPatterns.append(Text[i:i+k])
+    return FrequentPatterns
+
+# Problem: Find a reverse complement of a DNA string
+# Input: A DNA string named 'Pattern'
+# Output: 'Pattern_rc' i.e. the reverse complement of 'Pattern'
+def ReverseStrand(Pattern):
+    return Pattern[::-1]
+
+COMPLEMENT = str.maketrans('ACGTacgt', 'TGCATGCA')
+BYTES_COMPLEMENT = bytes.maketrans(b'ACGTacgt', b'TGCATGCA')
+
+def ReverseComplement(Pattern):
+    """
+    Complement every nucleotide with a single translate of the reversed
+    Pattern. Bytes-like Patterns (e.g. from GenomeFile) give bytes.
+    """
+    if isinstance(Pattern, str):
+        return ReverseStrand(Pattern).translate(COMPLEMENT)
+    return bytes(Pattern)[::-1].translate(BYTES_COMPLEMENT)
+
+# Problem: Find all occurences of a pattern in a string
+# Input: Strings Pattern and Genome
+# Output: All starting positions in Genome Where Pattern appears as a substring
+def PatternMatching(Pattern, Genome):
+    if hasattr(Genome, 'pattern_matching'):
+        return Genome.pattern_matching(Pattern)
+    if not isinstance(Genome, str) and isinstance(Pattern, str):
+        Pattern = Pattern.encode('ascii')
+    k = len(Pattern)
+    n = len(Genome)
+    position = []
+    for i in range(n-k+1):
+        if Genome[i:i+k] == Pattern:
+            position.append(i)
+    return position
+
+"""
+The following function does not search for a specific clump of a pattern, but
+rather all patterns that form clumps in genome. It is hope that one of those
+clumps will reveal the location of 'ori'.
+Question: Wich of these clumps would reveal 'ori'? Or, will *any* of these
+          clumps reveal 'ori'?
+Answer: We don't know.
+Remark: We know that DnaA boxes are usually 9 nucleoties long.
+Following Q and A are from the course Authors:
+Question: How does DnaA know which DnaA box to bind to?
+Answer: DnaA does not necessarily bind to just one DnaA box. In fact, it may
+        bind to all of them.
+
+A k-mer clump is a called such if it appears many times within a short interval
+of genome. A k-mer 'Pattern' forms an (L,t)-clump inside a 'Genome' if there is
+an interval of 'Genome' of length 'L' in which k-mer appears at least 't' times.
+
+Remark: It can be solved in several ways, by using:
+        - FrequentWords
+        - FasterFrequentWords i.e. using frequency array
+        - SortedFrequentWords i.e. finding frequent words by sorting
+"""
+# Problem: Find patterns forming clumps in a string
+# Input: A string Genome, and integers k, L, and t
+# Output: All distinct k-mers forming (L,t)-clumps in Genome
+def Clump(Genome, k, L, t):
+    clump = []
+    for i in range(len(Genome) - L + 1):
+        clumpCandidates = FrequentWordsWithDuplicates(Genome[i:i+L], k)
+        # ispitaj mi ovaj clump
+        # napravi mi recnik svih k-mera koje sam dobio
+        potentialClumps = {}
+        for pattern in RemoveDuplicates(clumpCandidates):
+            potentialClumps[pattern] = 0
+        # prebroj im njihovu ucestanost
+        for pattern in clumpCandidates:
+            potentialClumps[pattern] += 1
+        # ispitaj da li je neki od njih najmanje t puta tu, i zapamti
+        for pattern in potentialClumps:
+            if potentialClumps[pattern] >= t:
+                clump.append(pattern)
+    return RemoveDuplicates(clump)
+
+    # pogledaj prozor i:i+L
+    # pronadji u njemu sve najcesce k-mere
+    # pogledaj da li se neki od njih sadrzi vise ili jednako od 't' puta
+    # ako se nalazi, zapamti ga
+    # ponovi proces
+
+def BetterClumpFinding(Genome, k, L, t):
+    """
+    Slide a single window of length L along the Genome and keep one frequency
+    table of its k-mers. Moving the window one position to the right removes
+    the k-mer that leaves the window (first one) and adds the k-mer that
+    enters it (last one), so the whole Genome is processed in one pass instead
+    of recounting every window from scratch. A k-mer is remembered the first
+    time its count inside a window reaches 't'.
+    """
+    clump = []
+    found = set()
+    if len(Genome) < L:
+        return clump
+    if not isinstance(Genome, str):
+        Genome = bytes(Genome).decode('ascii')
+    Count = {}
+    for i in range(L - k + 1):
+        Pattern = Genome[i:i+k]
+        Count[Pattern] = Count.get(Pattern, 0) + 1
+        if Count[Pattern] >= t and Pattern not in found:
+            found.add(Pattern)
+            clump.append(Pattern)
+    for i in range(1, len(Genome) - L + 1):
+        FirstPattern = Genome[i-1:i-1+k]
+        Count[FirstPattern] -= 1
+        if Count[FirstPattern] == 0:
+            del Count[FirstPattern]
+        LastPattern = Genome[i+L-k:i+L]
+        Count[LastPattern] = Count.get(LastPattern, 0) + 1
+        if Count[LastPattern] >= t and LastPattern not in found:
+            found.add(LastPattern)
+            clump.append(LastPattern)
+    return clump
@@ -0,0 +1,383 @@
+# Week 2: the skew, Hamming distance, approximate pattern matching, d-neighborhoods
+# and frequent words with mismatches.
+
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import combinations, product
+
+from .lazy import np
+from .week1 import (
+    EncodeGenome, KmerCodes, NumberToPattern, NumbersToPatterns, PatternToNumber,
+    ReverseComplement
+)
+
+# Maximum number of neighborhoods (and mismatch masks) kept in memory
+NEIGHBORHOOD_CACHE_SIZE = 1024
+
+# Change of the skew for every nucleotide, given either as a character of a
+# string or as a byte of a bytes-like Genome (e.g. a view from GenomeFile)
+SKEW_STEP = { 'G' : 1, 'C' : -1, ord('G') : 1, ord('C') : -1 }
+
+# Problem: Calculate the skew array i.e. the difference betwee 'C' and 'G'
+# Input: Genome
+# Output: An array of values which represents the difference between 'C' and 'G'
+def Skew(Genome):
+    return OrderedDict(enumerate(SkewStream(Genome)))
+
+def SkewStream(Genome):
+    """
+    Generate the skew values Skew_0(Genome), ..., Skew_|Genome|(Genome) one by
+    one, so only the current value is kept in memory. Genome can be any
+    iterable of nucleotides, e.g. itertools.chain.from_iterable() over the
+    sequence_lines() of a GenomeFile.
+    """
+    skew = 0
+    yield skew
+    for nucleotide in Genome:
+        skew += SKEW_STEP.get(nucleotide, 0)
+        yield skew
+
+def SkewArray(Genome):
+    """
+    The whole skew array at once, as a cumulative sum of +1 for 'G' and -1 for
+    'C'. Returns a NumPy array of |Genome|+1 values, or a list without NumPy.
+    """
+    if np is None:
+        return list(SkewStream(Genome))
+    if isinstance(Genome, str):
+        Genome = Genome.encode('ascii')
+    nucleotides = np.frombuffer(Genome, dtype=np.uint8)
+    steps = np.zeros(len(nucleotides) + 1, dtype=np.int64)
+    steps[1:] = (nucleotides == ord('G')).astype(np.int64) - (nucleotides == ord('C'))
+    return np.cumsum(steps)
+
+# Problem: Find a position in a genome where the skew diagram attains a minimum
+# Input: A DNA string 'Genome'
+# Output: All integer(s) i minimizing Skew_i(Genome) among all values of 'i'
+#         (from 0 to |Genome|)
+def MinSkew(Genome):
+    """
+    Track the minimum while walking the skew once. Apart from the resulting
+    positions the memory used does not depend on the length of the Genome.
+    """
+    minimum = 0
+    minimum_indices = []
+    for position, count in enumerate(SkewStream(Genome)):
+        if count < minimum or not minimum_indices:
+            minimum = count
+            minimum_indices = [position]
+        elif count == minimum:
+            minimum_indices.append(position)
+    return minimum_indices
+
+# Problem: Compute the Hamming distance between two strings
+# Input: Two strings of equal length
+# Output: The Hamming distance between these strings
+def HammingDistance(p, q):
+    """
+    Count the mismatching pairs of nucleotides of two strings of the same
+    length. For whole batches of k-mers see WindowDistances and
+    DistanceMatrix.
+    """
+    if len(p) != len(q):
+        raise ValueError('HammingDistance needs strings of the same length')
+    distance = 0
+    for nucleotide, other in zip(p, q):
+        if nucleotide != other:
+            distance += 1
+    return distance
+
+# Problem: Find all approximate occurrences of a pattern in a string
+# Input: String 'Pattern' and 'Text' along with an integer 'd'
+# Output: All string positions where 'Pattern' appears as a substring of 'Text'
+#         with at most 'd' mismatches
+def ApproximatePatternMatching(Pattern, Text, d):
+    if hasattr(Text, 'approximate_pattern_matching'):
+        return Text.approximate_pattern_matching(Pattern, d)
+    positions = []
+    for i in range(len(Text)-len(Pattern)+1):
+        if HammingDistance(Pattern, Text[i:i+len(Pattern)]) <= d:
+            positions.append(i)
+    return positions
+
+# ApproximatePatternCount
+# Problem: Find the repetition number of Pattern in a Text with at most d
+#          mismatches
+# Input: 'Pattern', 'Text', and 'd'
+# Output: Number of patterns
+def CountWithMismatches(Pattern, Text, d):
+    if hasattr(Text, 'approximate_pattern_matching'):
+        return len(Text.approximate_pattern_matching(Pattern, d))
+    count = 0
+    for i in range(len(Text)-len(Pattern)+1):
+        if HammingDistance(Pattern, Text[i:i+len(Pattern)]) <= d:
+            count += 1
+    return count
+
+"""
+Bit-parallel approximate matching (Shift-Add, Baeza-Yates and Gonnet). Every
+position i of the Pattern gets a field of B bits in a single integer 'state'.
+After reading the j-th symbol of the Text, field i holds the number of
+mismatches between Pattern[0:i+1] and Text[j-i:j+1]. Reading the next symbol
+shifts all fields one place up and adds 1 to each field whose Pattern
+nucleotide differs from the symbol, so the whole Pattern is compared at once.
+A field is wide enough to never overflow into its neighbour, and all fields
+start at d+1, so alignments which do not fit into the Text yet never match.
+"""
+def ShiftAddMatches(Pattern, Text, d):
+    """
+    Generate every starting position in Text where 'Pattern' appears with at
+    most 'd' mismatches. Text may be a string or bytes-like (e.g. a view from
+    GenomeFile). Python integers are not limited to a machine word, so the
+    Pattern may be longer than 64 bases, it just makes the state wider.
+    """
+    if isinstance(Pattern, str):
+        Pattern = Pattern.encode('ascii')
+    if isinstance(Text, str):
+        Text = Text.encode('ascii')
+    m = len(Pattern)
+    if m == 0 or m > len(Text):
+        return
+    B = (m + d + 1).bit_length()
+    ones = int(('0' * (B - 1) + '1') * m, 2)
+    mask = (1 << (m * B)) - 1
+    last = (m - 1) * B
+    # Mismatch increments for every symbol, i.e. 1 in each field i where
+    # Pattern[i] differs from the symbol
+    mismatches = [ones] * 256
+    for symbol in set(Pattern):
+        increment = 0
+        for i, nucleotide in enumerate(Pattern):
+            if nucleotide != symbol:
+                increment |= 1 << (i * B)
+        mismatches[symbol] = increment
+    state = ones * (d + 1)
+    for j, symbol in enumerate(Text):
+        state = ((state << B) & mask) + mismatches[symbol]
+        if state >> last <= d:
+            yield j - m + 1
+
+def ShiftAddPatternMatching(Pattern, Text, d):
+    """
+    Same positions as ApproximatePatternMatching, found with ShiftAddMatches.
+    """
+    return list(ShiftAddMatches(Pattern, Text, d))
+
+def ShiftAddCountWithMismatches(Pattern, Text, d):
+    """
+    Same count as CountWithMismatches, found with ShiftAddMatches.
+    """
+    count = 0
+    for position in ShiftAddMatches(Pattern, Text, d):
+        count += 1
+    return count
+
+# Problem: Find the most frequent k-mers with mismatches in a string
+# Input: A string 'Text' as well as integers 'k' abd 'd'
+#        Assume that k .lte. 12, and d .lte. 3
+# Output: All most frequent k-mers with up to 'd' mismatches in 'Text'
+def ComputingFrequenciesWithMismatches(Text, k, d):
+    FrequencyArray = {}
+    for i in range(4**k):
+        FrequencyArray[i] = 0
+    # Alternatively: [0] * (4**k) = [0, ..., 0] where len([given_list]) = 4**k
+    for i in range(len(Text)-k+1):
+        Pattern = Text[i:i+k]
+        Neighborhood = Neighbors(Pattern, d)
+        for ApproximatePattern in Neighborhood:
+            j = PatternToNumber(ApproximatePattern)
+            FrequencyArray[j] += 1
+    return FrequencyArray
+
+@lru_cache(maxsize=NEIGHBORHOOD_CACHE_SIZE)
+def MismatchMasks(k, d):
+    """
+    All numbers which, XOR-ed with the number of a k-mer (see PatternToNumber),
+    change at most 'd' of its nucleotides. Each nucleotide is a 2-bit slot and
+    XOR with 1, 2 or 3 turns it into one of the three other nucleotides, so the
+    masks give every k-mer within distance 'd' exactly once.
+    """
+    masks = [0]
+    for distance in range(1, min(d, k) + 1):
+        for positions in combinations(range(k), distance):
+            for substitutions in product((1, 2, 3), repeat=distance):
+                mask = 0
+                for position, substitution in zip(positions, substitutions):
+                    mask |= substitution << (2 * position)
+                masks.append(mask)
+    return tuple(masks)
+
+@lru_cache(maxsize=NEIGHBORHOOD_CACHE_SIZE)
+def SuffixNeighborhood(number, k, d):
+    """
+    Neighbors (see below) on numbers instead of strings: a tuple of pairs
+    (neighbor, distance) for all k-mers within distance 'd' of the k-mer with
+    the given number. Its suffix, the lower 2*(k-1) bits, is handled first.
+    A suffix neighbor which is closer than 'd' may take any first nucleotide,
+    the others keep the first nucleotide of the k-mer. Every neighbor is
+    built once and its distance is carried along, so no HammingDistance is
+    needed. Neighborhoods of suffixes are shared by many k-mers, so they are
+    kept in a bounded LRU cache.
+    """
+    if k == 0:
+        return ((0, 0),)
+    shift = 2 * (k - 1)
+    first = number >> shift
+    neighborhood = []
+    for neighbor, distance in SuffixNeighborhood(number & ((1 << shift) - 1), k - 1, d):
+        if distance < d:
+            for nucleotide in range(4):
+                neighborhood.append(((nucleotide << shift) | neighbor, distance + (nucleotide != first)))
+        else:
+            neighborhood.append(((first << shift) | neighbor, distance))
+    return tuple(neighborhood)
+
+def NeighborNumbers(number, k, d):
+    """
+    Generate the numbers of all k-mers within Hamming distance 'd' of the k-mer
+    with the given number, each of them once. Only the neighborhood of the
+    suffix is taken from the cache, the neighbors themselves are generated
+    lazily.
+    """
+    if k == 0:
+        yield 0
+        return
+    shift = 2 * (k - 1)
+    first = number >> shift
+    for neighbor, distance in SuffixNeighborhood(number & ((1 << shift) - 1), k - 1, d):
+        if distance < d:
+            for nucleotide in range(4):
+                yield (nucleotide << shift) | neighbor
+        else:
+            yield (first << shift) | neighbor
+
+def FastNeighbors(Pattern, d):
+    """
+    The same neighborhood as Neighbors, generated lazily from NeighborNumbers.
+    """
+    k = len(Pattern)
+    for number in NeighborNumbers(PatternToNumber(Pattern), k, d):
+        yield NumberToPattern(number, k)
+
+def ReverseComplementNumber(number, k):
+    """
+    Number of the reverse complement of the k-mer with the given number.
+    Complementing a nucleotide is XOR with 3 (A=0 <-> T=3, C=1 <-> G=2).
+    """
+    reverse = 0
+    for i in range(k):
+        reverse = (reverse << 2) | (3 - (number & 3))
+        number >>= 2
+    return reverse
+
+def FastComputingFrequenciesWithMismatches(Text, k, d, reverse_complements=False):
+    """
+    Frequency array with mismatches: the entry of every k-mer Pattern is the
+    number of k-mers in Text within distance 'd' of it, i.e.
+    CountWithMismatches(Pattern, Text, d). Neighborhoods are enumerated as
+    numbers (see MismatchMasks) instead of strings. With NumPy all distinct
+    k-mers of Text are shifted by one mask at a time into a dense array.
+    With 'reverse_complements' the k-mers of the reverse complement strand are
+    counted too, so every entry becomes Count_d(Text, Pattern) +
+    Count_d(Text, ReverseComplement(Pattern)).
+    """
+    if np is None:
+        FrequencyArray = [0] * (4**k)
+        if not isinstance(Text, str):
+            Text = bytes(Text).decode('ascii')
+        Strands = [Text, ReverseComplement(Text)] if reverse_complements else [Text]
+        for Strand in Strands:
+            for i in range(len(Strand)-k+1):
+                for j in NeighborNumbers(PatternToNumber(Strand[i:i+k]), k, d):
+                    FrequencyArray[j] += 1
+        return FrequencyArray
+    Codes = EncodeGenome(Text)
+    numbers = KmerCodes(Codes, k)
+    if reverse_complements:
+        numbers = np.concatenate((numbers, KmerCodes(3 - Codes[::-1], k)))
+    numbers, counts = np.unique(numbers, return_counts=True)
+    FrequencyArray = np.zeros(4**k, dtype=np.int64)
+    for mask in MismatchMasks(k, d):
+        # XOR with a mask is a bijection, so no index repeats within one step
+        FrequencyArray[numbers ^ mask] += counts
+    return FrequencyArray
+
+# Problem: Find the most frequent k-mers with mismatches (and reverse
+#          complements) in a string
+# Input: A string 'Text' as well as integers 'k' and 'd'
+# Output: All k-mers Pattern maximizing Count_d(Text, Pattern), or with
+#         'reverse_complements' the sum Count_d(Text, Pattern) +
+#         Count_d(Text, ReverseComplement(Pattern))
+def FasterFrequentWordsWithMismatches(Text, k, d, reverse_complements=False):
+    FrequencyArray = FastComputingFrequenciesWithMismatches(Text, k, d, reverse_complements)
+    maxCount = FrequencyArray.max() if np is not None else max(FrequencyArray)
+    # a Text shorter than k has no k-mers at all
+    if maxCount == 0:
+        return []
+    if np is not None:
+        indices = np.flatnonzero(FrequencyArray == maxCount)
+    else:
+        indices = [i for i in range(4**k) if FrequencyArray[i] == maxCount]
+    return NumbersToPatterns(indices, k)
+
+def ImmediateNeighbors(Pattern):
+    Neighborhood = [Pattern]
+    for i in range(0,len(Pattern)):
+        symbol = Pattern[i]
+        listOfNucleotides = ['A', 'C', 'G', 'T']
+        listOfNucleotides.remove(symbol)
+        for nucleotide in listOfNucleotides:
+            PatternPrime = list(Pattern)
+            PatternPrime[i] = nucleotide
+            Neighbor = ''.join(PatternPrime)
+            Neighborhood.append(Neighbor)
+    return Neighborhood
+
+def IterativeNeighbors(Pattern, d):
+    """
+    Grow the neighborhood one mismatch at a time. Only the patterns found in
+    the previous step are expanded; extending the list while looping over it
+    used to expand the new patterns in the same step, which returned patterns
+    further away than 'd'. A set replaces RemoveDuplicates.
+    """
+    Neighborhood = [Pattern]
+    found = set(Neighborhood)
+    Frontier = [Pattern]
+    for j in range(0,d):
+        NextFrontier = []
+        for NeighPattern in Frontier:
+            for Neighbor in ImmediateNeighbors(NeighPattern):
+                if Neighbor not in found:
+                    found.add(Neighbor)
+                    NextFrontier.append(Neighbor)
+        Neighborhood += NextFrontier
+        Frontier = NextFrontier
+    return Neighborhood
+
+def Neighbors(Pattern, d):
+    if d == 0: # ako je hamingova razdaljina nula, samo mi vrati obrazac
+        return [Pattern]
+    if len(Pattern) == 1:
+        # ako je obrazac samo jedan nukleotid, vrati mi sve posto su to sve
+        # varijacije na dati obrazac
+        return ['A', 'C', 'G', 'T']
+    # u normalnom radu, skrati mi pattern (suffix) i onda za svakog suseda iz
+    # sufiksa, ako je hamingova razdaljina manja od 'd' izmedju sufiksa ulaznog
+    # obrasca i teksta iz skupa sufiksa, onda dodaj kao prefiks na taj teks sve
+    # nukleotide. Ako nije to slucaj, onda samo dodaj natrag prvo slovo obrasca
+    # na tekst. I naravno, vrati mi rezultat
+    Neighborhood = []
+    SuffixNeighbors = Neighbors(Suffix(Pattern), d)
+    for Text in SuffixNeighbors:
+        if HammingDistance(Suffix(Pattern), Text) < d:
+            for nucleotide in 'ACGT':
+                Neighborhood.append(nucleotide + Text)
+        else:
+            Neighborhood.append(FirstSymbol(Pattern) + Text)
+    return Neighborhood
+
+def FirstSymbol(Pattern):
+    return Pattern[0]
+
+def Suffix(Pattern):
+    return Pattern[1:]
@@ -0,0 +1,224 @@
+#!/usr/bin/python
+
+# Benchmarks of the functions in the dna package, on the bundled datasets (the
+# jobs listed in ../regression.txt) and on random genomes of growing size.
+# example how to run this program in shell:
+# ./benchmark.py --output benchmarks/today.json
+# ./benchmark.py --output benchmarks/after.json --compare benchmarks/today.json
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import dna as r
+
+PATTERN = 'ATGATCAAG'
+
+# Benchmarks on random genomes: name, function of the genome, and the largest
+# genome it is run on (the reference implementations are quadratic or worse)
+BENCHMARKS = [
+    ('PatternCount', lambda Genome: r.PatternCount(Genome, PATTERN), 10**6),
+    ('PatternMatching', lambda Genome: r.PatternMatching(PATTERN, Genome), 10**6),
+    ('MultiplePatternMatching', lambda Genome: r.MultiplePatternMatching(
+        [PATTERN, 'CTTGATCAT', 'TTATCCACA'], Genome, True), 10**6),
+    ('FrequentWords', lambda Genome: r.FrequentWords(Genome, 9), 10**3),
+    ('BetterFrequentWords', lambda Genome: r.BetterFrequentWords(Genome, 9), 10**6),
+    ('FasterFrequentWords', lambda Genome: r.FasterFrequentWords(Genome, 9), 10**6),
+    ('FindFrequentWords', lambda Genome: r.FindFrequentWords(Genome, 9), 10**6),
+    ('SortedFrequentWords', lambda Genome: r.SortedFrequentWords(Genome, 20), 10**6),
+    ('CountKmers.top', lambda Genome: r.CountKmers(Genome, 9).top(100), 10**6),
+    ('SketchFrequentWords', lambda Genome: r.SketchFrequentWords([Genome], 25), 10**6),
+    ('ExternalFrequentWords', lambda Genome: r.ExternalFrequentWords(
+        Genome, 20, 2**16), 10**6),
+    ('ComputingFrequencies', lambda Genome: r.ComputingFrequencies(Genome, 6), 10**5),
+    ('FastComputingFrequencies', lambda Genome: r.FastComputingFrequencies(Genome, 9), 10**6),
+    ('CanonicalComputingFrequencies', lambda Genome: r.FastComputingFrequencies(
+        Genome, 9, True), 10**6),
+    ('ReverseComplement', lambda Genome: r.ReverseComplement(Genome), 10**6),
+    ('Clump', lambda Genome: r.Clump(Genome, 5, 100, 3), 10**3),
+    ('BetterClumpFinding', lambda Genome: r.BetterClumpFinding(Genome, 9, 500, 3), 10**6),
+    ('Skew', lambda Genome: r.Skew(Genome), 10**6),
+    ('SkewArray', lambda Genome: r.SkewArray(Genome), 10**6),
+    ('MinSkew', lambda Genome: r.MinSkew(Genome), 10**6),
+    ('HammingDistance', lambda Genome: r.HammingDistance(Genome, Genome[::-1]), 10**6),
+    ('ApproximatePatternMatching', lambda Genome: r.ApproximatePatternMatching(
+        PATTERN, Genome, 2), 10**5),
+    ('ShiftAddPatternMatching', lambda Genome: r.ShiftAddPatternMatching(
+        PATTERN, Genome, 2), 10**6),
+    ('HammingPatternMatching', lambda Genome: r.HammingPatternMatching(
+        PATTERN, Genome, 2), 10**6),
+    ('CountWithMismatches', lambda Genome: r.CountWithMismatches(PATTERN, Genome, 2), 10**5),
+    ('ShiftAddCountWithMismatches', lambda Genome: r.ShiftAddCountWithMismatches(
+        PATTERN, Genome, 2), 10**6),
+    ('FasterFrequentWordsWithMismatches', lambda Genome: r.FasterFrequentWordsWithMismatches(
+        Genome, 9, 2), 10**5),
+    ('DistanceMatrix', lambda Genome: r.DistanceMatrix(
+        [Genome[i:i+12] for i in range(0, len(Genome) - 11, 12)]), 10**5),
+    ('PackedGenome', lambda Genome: r.PackedGenome(Genome), 10**6),
+    ('GenomeIndex', lambda Genome: r.GenomeIndex(Genome), 10**6),
+    ('PatternsToNumbers', lambda Genome: r.PatternsToNumbers(
+        [Genome[i:i+12] for i in range(0, len(Genome) - 11, 12)]), 10**6),
+    ('NumbersToPatterns', lambda Genome: r.NumbersToPatterns(range(len(Genome) // 12), 12), 10**6),
+]
+
+# Benchmarks which do not depend on a genome, they are run once
+FIXED_BENCHMARKS = [
+    ('Neighbors', lambda: r.Neighbors('ACGTACGTAC', 3)),
+    ('IterativeNeighbors', lambda: r.IterativeNeighbors('ACGTACGTAC', 3)),
+    ('FastNeighbors', lambda: list(r.FastNeighbors('ACGTACGTAC', 3))),
+]
+
+def RandomGenome(size, seed=0):
+    return ''.join(random.Random(seed).choices('ACGT', k=size))
+
+def Measure(function, repeat):
+    """
+    Best wall time of 'repeat' calls, and the peak memory allocated by one
+    more call (traced separately, since tracing slows the call down).
+    """
+    seconds = float('inf')
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+def Result(name, source, size, seconds, peak):
+    return {
+        'name' : name,
+        'input' : source,
+        'size' : size,
+        'seconds' : seconds,
+        'bases_per_second' : size / seconds if size and seconds else None,
+        'peak_bytes' : peak,
+    }
+
+def DatasetBenchmarks(manifest, repeat):
+    """
+    Time the solver of every job in the manifest on its dataset.
+    """
+    results = []
+    for problem, dataset, output, expected in r.ReadManifest(manifest):
+        lines = r.DatasetLines(dataset)
+        seconds, peak = Measure(lambda: r.PROBLEMS[problem](lines), repeat)
+        source = os.path.relpath(dataset, os.path.dirname(os.path.abspath(manifest)))
+        results.append(Result(problem, source, sum(map(len, lines)), seconds, peak))
+    return results
+
+def SyntheticBenchmarks(sizes, repeat):
+    results = []
+    for size in sizes:
+        Genome = RandomGenome(size)
+        for name, function, max_size in BENCHMARKS:
+            if size <= max_size:
+                seconds, peak = Measure(lambda: function(Genome), repeat)
+                results.append(Result(name, 'random', size, seconds, peak))
+    for name, function in FIXED_BENCHMARKS:
+        seconds, peak = Measure(function, repeat)
+        results.append(Result(name, 'fixed', None, seconds, peak))
+    return results
+
+def Scaling(results):
+    """
+    Scaling curve of every function on random genomes: the time for each size,
+    and the exponent e of time ~ size**e fitted between the smallest and the
+    largest size (1 is linear, 2 quadratic).
+    """
+    curves = {}
+    for result in results:
+        if result['input'] == 'random':
+            curves.setdefault(result['name'], []).append((result['size'], result['seconds']))
+    scaling = {}
+    for name, curve in curves.items():
+        (first_size, first_seconds), (last_size, last_seconds) = curve[0], curve[-1]
+        exponent = None
+        if last_size > first_size and first_seconds > 0 and last_seconds > 0:
+            exponent = math.log(last_seconds / first_seconds) / math.log(last_size / first_size)
+        scaling[name] = {'curve' : curve, 'exponent' : exponent}
+    return scaling
+
+def Compare(results, baseline, threshold, min_seconds):
+    """
+    Compare with the results of an earlier run. Return (name, input, size,
+    ratio) for every benchmark which got more than 'threshold' times slower.
+    Very short runs are skipped, they are mostly noise.
+    """
+    before = {}
+    for result in baseline['results']:
+        before[(result['name'], result['input'], result['size'])] = result['seconds']
+    regressions = []
+    for result in results:
+        key = (result['name'], result['input'], result['size'])
+        if key in before and max(before[key], result['seconds']) >= min_seconds:
+            ratio = result['seconds'] / before[key]
+            if ratio > threshold:
+                regressions.append(key + (ratio,))
+    return regressions
+
+def Report(results, scaling):
+    for result in results:
+        throughput = result['bases_per_second']
+        print('%-34s %-42s %9s %10.4fs %14s %10.1f kB' % (
+            result['name'], result['input'], result['size'] or '-', result['seconds'],
+            '%.3g b/s' % throughput if throughput else '-', result['peak_bytes'] / 1024.0))
+    print('')
+    for name, curve in sorted(scaling.items()):
+        if curve['exponent'] is not None:
+            print('%-34s time ~ size^%.2f' % (name, curve['exponent']))
+
+if __name__ == '__main__':
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--manifest', default=os.path.join(here, '..', 'regression.txt'),
+                        help='datasets to benchmark, as for replication.py --manifest')
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000',
+                        help='comma separated sizes of the random genomes')
+    parser.add_argument('--repeat', type=int, default=3, help='best of this many runs')
+    parser.add_argument('--output', help='save the results to this JSON file')
+    parser.add_argument('--compare', help='JSON file of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slow down which counts as a regression')
+    parser.add_argument('--min-seconds', type=float, default=0.001,
+                        help='ignore runs shorter than this when comparing')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    results = DatasetBenchmarks(args.manifest, args.repeat) + SyntheticBenchmarks(sizes, args.repeat)
+    scaling = Scaling(results)
+    Report(results, scaling)
+
+    if args.output:
+        if os.path.dirname(args.output):
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python' : platform.python_version(),
+                'numpy' : r.np.__version__ if r.np is not None else None,
+                'time' : time.strftime('%Y-%m-%d %H:%M:%S'),
+                'results' : results,
+                'scaling' : scaling,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = Compare(results, json.load(f), args.threshold, args.min_seconds)
+        print('')
+        for name, source, size, ratio in regressions:
+            print('REGRESSION %-34s %-42s %9s %.2fx slower' % (name, source, size or '-', ratio))
+        if regressions:
+            sys.exit(1)
+        print('no regressions')
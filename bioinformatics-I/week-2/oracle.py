@@ -0,0 +1,313 @@
+#!/usr/bin/python
+
+# Correctness oracle for the fast engines in the dna package. It checks:
+# - the answers to the bundled datasets against the known correct outputs
+#   listed in ../regression.txt,
+# - every fast engine against the simple reference implementation on random
+#   genomes, and reports the first case and position where they diverge.
+# example how to run this program in shell:
+# ./oracle.py
+# ./oracle.py --cases 1000 --seed 7
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import dna as r
+
+# Problems whose answer is a collection, i.e. the order does not matter
+UNORDERED = set([
+    'FrequentWords', 'ClumpFinding', 'ImmediateNeighbors', 'Neighbors',
+    'FrequentWordsWithMismatches',
+])
+
+# Clump only looks at the most frequent k-mers of every window, so it misses a
+# k-mer which appears t times next to an even more frequent one. This follows
+# the definition of an (L,t)-clump directly.
+def ReferenceClump(Genome, k, L, t):
+    clump = []
+    for i in range(len(Genome) - L + 1):
+        Window = Genome[i:i+L]
+        for j in range(L - k + 1):
+            Pattern = Window[j:j+k]
+            if Pattern not in clump and r.PatternCount(Window, Pattern) >= t:
+                clump.append(Pattern)
+    return clump
+
+def ReferenceCanonicalFrequencies(Text, k):
+    FrequencyArray = [0] * (4**k)
+    for i in range(len(Text)-k+1):
+        Pattern = Text[i:i+k]
+        FrequencyArray[r.PatternToNumber(min(Pattern, r.ReverseComplement(Pattern)))] += 1
+    return FrequencyArray
+
+def ReferenceMinSkew(Genome):
+    skew = list(r.Skew(Genome).values())
+    return [position for position, count in enumerate(skew) if count == min(skew)]
+
+def ReferenceFrequentWordsWithMismatches(Text, k, d, reverse_complements=False):
+    FrequencyArray = r.ComputingFrequenciesWithMismatches(Text, k, d)
+    if reverse_complements:
+        Reverse = r.ComputingFrequenciesWithMismatches(r.ReverseComplement(Text), k, d)
+        for i in FrequencyArray:
+            FrequencyArray[i] += Reverse[i]
+    maxCount = max(FrequencyArray.values())
+    return [r.NumberToPattern(i, k) for i in FrequencyArray if FrequencyArray[i] == maxCount]
+
+def ReferenceTop(Text, k, N):
+    return sorted(r.FrequencyTable(Text, k).items(), key=lambda item: (-item[1], item[0]))[:N]
+
+def ReferenceAtLeast(Text, k, t):
+    return sorted(item for item in r.FrequencyTable(Text, k).items() if item[1] >= max(t, 1))
+
+def ReferenceHistogram(Text, k):
+    counts = list(r.FrequencyTable(Text, k).values())
+    return [counts.count(c) for c in range(1, max(counts) + 1)]
+
+def Accumulate(accumulator, Genome, size=7):
+    r.FeedChunks([Genome[i:i+size] for i in range(0, len(Genome), size)], [accumulator])
+    return accumulator
+
+def RandomDNA(rng, low, high, alphabet='ACGT'):
+    return ''.join(rng.choice(alphabet) for i in range(rng.randint(low, high)))
+
+# Random inputs: a genome from a small alphabet has many repeats, which makes
+# ties and clumps likely
+def GenomeCase(rng):
+    return (RandomDNA(rng, 0, 300, rng.choice(['ACGT', 'ACG', 'AT'])),)
+
+def GenomeKCase(rng):
+    k = rng.randint(1, 5)
+    return RandomDNA(rng, k, 300, rng.choice(['ACGT', 'AT'])), k
+
+def LongKCase(rng):
+    k = rng.randint(1, 32)
+    return RandomDNA(rng, k, 300, rng.choice(['ACGT', 'AT', 'A'])), k
+
+def PatternGenomeCase(rng):
+    return (RandomDNA(rng, 1, 6), RandomDNA(rng, 0, 300, rng.choice(['ACGT', 'AC'])))
+
+def ApproximateCase(rng):
+    Pattern, Genome = PatternGenomeCase(rng)
+    return Pattern, Genome, rng.randint(0, 3)
+
+def ClumpCase(rng):
+    k = rng.randint(2, 5)
+    L = rng.randint(k, 60)
+    return RandomDNA(rng, 0, 300, rng.choice(['ACGT', 'AT'])), k, L, rng.randint(2, 5)
+
+def KmersCase(rng):
+    k = rng.randint(1, 32)
+    return ([RandomDNA(rng, k, k) for i in range(rng.randint(1, 12))],)
+
+def TopCase(rng):
+    return LongKCase(rng) + (rng.randint(0, 20),)
+
+def NeighborsCase(rng):
+    return RandomDNA(rng, 1, 7), rng.randint(0, 3)
+
+def MismatchCase(rng):
+    k = rng.randint(1, 4)
+    return RandomDNA(rng, k, 60), k, rng.randint(0, 2)
+
+def MismatchReverseCase(rng):
+    return MismatchCase(rng) + (True,)
+
+# Every check: name, reference, fast engine, random input, and whether the
+# order of the answer matters
+CHECKS = [
+    ('PatternCount/PackedGenome', r.PatternCount,
+        lambda Text, Pattern: r.PatternCount(r.PackedGenome(Text), Pattern),
+        lambda rng: PatternGenomeCase(rng)[::-1], True),
+    ('PatternMatching/PackedGenome', r.PatternMatching,
+        lambda Pattern, Genome: r.PatternMatching(Pattern, r.PackedGenome(Genome)),
+        PatternGenomeCase, True),
+    ('PatternMatching/GenomeIndex', r.PatternMatching,
+        lambda Pattern, Genome: r.PatternMatching(Pattern, r.GenomeIndex(Genome)),
+        PatternGenomeCase, True),
+    ('PatternMatching/MultiplePatternMatching', r.PatternMatching,
+        lambda Pattern, Genome: r.MultiplePatternMatching([Pattern], Genome)[Pattern],
+        PatternGenomeCase, True),
+    ('FrequentWords/BetterFrequentWords', r.FrequentWords, r.BetterFrequentWords,
+        GenomeKCase, False),
+    ('FrequentWords/FasterFrequentWords', r.FrequentWords, r.FasterFrequentWords,
+        GenomeKCase, False),
+    ('FrequentWords/FindFrequentWords', r.FrequentWords, r.FindFrequentWords,
+        GenomeKCase, False),
+    ('FrequentWords/SortedFrequentWords', r.FrequentWords, r.SortedFrequentWords,
+        LongKCase, False),
+    ('FrequentWords/ExternalFrequentWords', r.FrequentWords,
+        lambda Text, k: r.ExternalFrequentWords(Text, k, 17), LongKCase, False),
+    ('FrequentWords/ParallelFrequentWords', r.FrequentWords,
+        lambda Text, k: r.ParallelFrequentWords(Text, k, 1, 37), GenomeKCase, False),
+    ('ComputingFrequencies/FastComputingFrequencies',
+        lambda Text, k: list(r.ComputingFrequencies(Text, k).values()),
+        r.FastComputingFrequencies, GenomeKCase, True),
+    ('ComputingFrequencies/ParallelComputingFrequencies',
+        lambda Text, k: list(r.ComputingFrequencies(Text, k).values()),
+        lambda Text, k: r.ParallelComputingFrequencies(Text, k, 1, 37), GenomeKCase, True),
+    ('ComputingFrequencies/canonical', ReferenceCanonicalFrequencies,
+        lambda Text, k: list(r.ComputingFrequencies(Text, k, True).values()), GenomeKCase, True),
+    ('FastComputingFrequencies/canonical', ReferenceCanonicalFrequencies,
+        lambda Text, k: r.FastComputingFrequencies(Text, k, True), GenomeKCase, True),
+    ('FrequentWords/canonical', lambda Text, k: r.FrequentWords(Text, k, True),
+        lambda Text, k: r.FasterFrequentWords(Text, k, True), GenomeKCase, False),
+    ('Clump/BetterClumpFinding', ReferenceClump, r.BetterClumpFinding, ClumpCase, False),
+    ('Clump/ParallelClumpFinding', ReferenceClump,
+        lambda Genome, k, L, t: r.ParallelClumpFinding(Genome, k, L, t, 1, 41),
+        ClumpCase, False),
+    ('Skew/SkewArray', lambda Genome: list(r.Skew(Genome).values()), r.SkewArray,
+        GenomeCase, True),
+    ('MinSkew', ReferenceMinSkew, r.MinSkew, GenomeCase, True),
+    ('MinSkew/SkewAccumulator', ReferenceMinSkew,
+        lambda Genome: Accumulate(r.SkewAccumulator(), Genome).minimum_indices, GenomeCase, True),
+    ('FrequentWords/KmerAccumulator', r.FrequentWords,
+        lambda Text, k: Accumulate(r.KmerAccumulator(k), Text).frequent_words(), GenomeKCase, False),
+    ('Clump/ClumpAccumulator', ReferenceClump,
+        lambda Genome, k, L, t: Accumulate(r.ClumpAccumulator(k, L, t), Genome).clump,
+        ClumpCase, False),
+    ('FrequentWords/KmerCounts', r.FrequentWords,
+        lambda Text, k: r.CountKmers(Text, k).frequent_words(), LongKCase, False),
+    ('Top/KmerCounts', ReferenceTop, lambda Text, k, N: r.CountKmers(Text, k).top(N),
+        TopCase, True),
+    ('AtLeast/KmerCounts', ReferenceAtLeast,
+        lambda Text, k, t: list(r.CountKmers(Text, k).at_least(t)), TopCase, True),
+    ('Histogram/KmerCounts', ReferenceHistogram,
+        lambda Text, k: list(r.CountKmers(Text, k).histogram())[1:], LongKCase, True),
+    ('FrequentWords/SketchFrequentWords', r.FrequentWords,
+        lambda Text, k: r.SketchFrequentWords([Text], k, r.SketchGenomes([Text], k, 16, 2, 64)),
+        LongKCase, False),
+    ('Clump/SketchClumpFinding', ReferenceClump,
+        lambda Genome, k, L, t: r.SketchClumpFinding(Genome, k, L, t, r.SketchGenomes([Genome], k, 16, 2)),
+        ClumpCase, False),
+    ('ApproximatePatternMatching/ShiftAddPatternMatching', r.ApproximatePatternMatching,
+        r.ShiftAddPatternMatching, ApproximateCase, True),
+    ('ApproximatePatternMatching/PackedGenome', r.ApproximatePatternMatching,
+        lambda Pattern, Text, d: r.ApproximatePatternMatching(Pattern, r.PackedGenome(Text), d),
+        ApproximateCase, True),
+    ('ApproximatePatternMatching/GenomeIndex', r.ApproximatePatternMatching,
+        lambda Pattern, Text, d: r.ApproximatePatternMatching(Pattern, r.GenomeIndex(Text), d),
+        ApproximateCase, True),
+    ('ApproximatePatternMatching/HammingPatternMatching', r.ApproximatePatternMatching,
+        r.HammingPatternMatching, ApproximateCase, True),
+    ('CountWithMismatches/ShiftAddCountWithMismatches', r.CountWithMismatches,
+        r.ShiftAddCountWithMismatches, ApproximateCase, True),
+    ('CountWithMismatches/HammingCountWithMismatches', r.CountWithMismatches,
+        r.HammingCountWithMismatches, ApproximateCase, True),
+    ('HammingDistance/DistanceMatrix',
+        lambda Patterns: [[r.HammingDistance(p, q) for q in Patterns] for p in Patterns],
+        lambda Patterns: r.DistanceMatrix(Patterns, chunk_size=7).tolist(),
+        KmersCase, True),
+    ('Neighbors/FastNeighbors', r.Neighbors,
+        lambda Pattern, d: list(r.FastNeighbors(Pattern, d)), NeighborsCase, False),
+    ('Neighbors/IterativeNeighbors', r.Neighbors, r.IterativeNeighbors, NeighborsCase, False),
+    ('ComputingFrequenciesWithMismatches/FastComputingFrequenciesWithMismatches',
+        lambda Text, k, d: list(r.ComputingFrequenciesWithMismatches(Text, k, d).values()),
+        r.FastComputingFrequenciesWithMismatches, MismatchCase, True),
+    ('FrequentWordsWithMismatches/FasterFrequentWordsWithMismatches',
+        ReferenceFrequentWordsWithMismatches, r.FasterFrequentWordsWithMismatches,
+        MismatchReverseCase, False),
+]
+
+def Tokens(answer):
+    """
+    Turn an answer (a number, string, list, NumPy array or output text) into
+    a list of strings, so answers of different types can be compared.
+    """
+    if isinstance(answer, str):
+        return answer.split()
+    if isinstance(answer, (int, bytes)) or not hasattr(answer, '__iter__'):
+        return [str(answer)]
+    return [str(token) for token in answer]
+
+def FirstDivergence(expected, actual, ordered):
+    """
+    Describe the first point where two answers differ, or return None if they
+    are the same. Unordered answers are compared as sorted collections.
+    """
+    expected, actual = Tokens(expected), Tokens(actual)
+    if not ordered:
+        if sorted(expected) == sorted(actual):
+            return None
+        missing = sorted(set(expected) - set(actual))
+        extra = sorted(set(actual) - set(expected))
+        if missing or extra:
+            return 'missing %s, extra %s' % (missing[:5], extra[:5])
+        return 'same items but different multiplicity (%d vs %d items)' % (len(expected), len(actual))
+    for position, (want, got) in enumerate(zip(expected, actual)):
+        if want != got:
+            return 'item %d: expected %s, got %s' % (position, want, got)
+    if len(expected) != len(actual):
+        return 'expected %d items, got %d' % (len(expected), len(actual))
+    return None
+
+def Shorten(value, width=60):
+    text = repr(value)
+    return text if len(text) <= width else text[:width-3] + '...'
+
+def CheckSavedOutputs(manifest):
+    """
+    Solve every dataset of the manifest which has a known correct output and
+    compare. Returns the number of failures.
+    """
+    failures = 0
+    base = os.path.dirname(os.path.abspath(manifest))
+    for problem, dataset, output, expected in r.ReadManifest(manifest):
+        if expected is None:
+            continue
+        with open(expected) as f:
+            known = f.read()
+        divergence = FirstDivergence(known, r.PROBLEMS[problem](r.DatasetLines(dataset)),
+                                     problem not in UNORDERED)
+        status = 'ok' if divergence is None else 'FAIL: ' + divergence
+        failures += divergence is not None
+        print('%-28s %-42s %s' % (problem, os.path.relpath(dataset, base), status))
+    return failures
+
+def CheckEngines(cases, seed):
+    """
+    Run every check on 'cases' random inputs, stop a check at its first
+    divergence. Returns the number of failed checks.
+    """
+    failures = 0
+    for name, reference, fast, make_case, ordered in CHECKS:
+        rng = random.Random(seed)
+        divergence = None
+        for case in range(cases):
+            arguments = make_case(rng)
+            expected = reference(*arguments)
+            try:
+                divergence = FirstDivergence(expected, fast(*arguments), ordered)
+            except Exception as error:
+                divergence = 'raised %s: %s' % (type(error).__name__, error)
+            if divergence is not None:
+                break
+        if divergence is None:
+            print('%-72s ok (%d cases)' % (name, cases))
+        else:
+            failures += 1
+            print('%-72s FAIL at case %d' % (name, case))
+            print('    arguments: %s' % ', '.join(Shorten(argument) for argument in arguments))
+            print('    %s' % divergence)
+    return failures
+
+if __name__ == '__main__':
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--manifest', default=os.path.join(here, '..', 'regression.txt'),
+                        help='datasets with known correct outputs, as for replication.py')
+    parser.add_argument('--cases', type=int, default=200,
+                        help='random inputs for every engine')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random inputs')
+    args = parser.parse_args()
+
+    failures = CheckSavedOutputs(args.manifest)
+    print('')
+    failures += CheckEngines(args.cases, args.seed)
+    if failures:
+        print('\n%d check(s) diverged' % failures)
+        sys.exit(1)
+    print('\nall checks passed')